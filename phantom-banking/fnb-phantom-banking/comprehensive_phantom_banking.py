@@ -20,24 +20,39 @@ from flask import (
     Flask,
     request,
     jsonify,
-    render_template_string,
+    render_template,
+    stream_template,
     redirect,
     url_for,
     flash,
     session,
+    make_response,
+    Response,
 )
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import bindparam, case, event, select, true
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
 from flask_restx import Api, Resource, fields, Namespace
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import uuid
 import json
 import hashlib
+import os
 import secrets
+import orjson
 import qrcode
 import io
 import base64
-from functools import wraps
+import brotli
+import gzip
+from functools import lru_cache, wraps
 import re
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
@@ -45,18 +60,70 @@ from enum import Enum
 from abc import ABC, abstractmethod
 import threading
 import time
+import queue
+import select as select_module
+import sqlite3
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
 
 # ==========================================
 # ENTERPRISE CONFIGURATION
 # ==========================================
 
 
+def _pool_share() -> int:
+    """Database connections one worker process may hold (pool plus overflow)"""
+    # Every gunicorn worker has its own pool, so the server's limit is split
+    # between them: DB_MAX_CONNECTIONS (postgres:15 defaults to 100) less
+    # DB_RESERVED_CONNECTIONS for everything else on the server, by default the
+    # mock bank's two workers at 15 each plus 10 for admin sessions. Each worker
+    # also keeps one connection outside its pool for the dashboard listener, so
+    # with the default 8 workers the pools get 6 apiece
+    workers = int(
+        os.environ.get("GUNICORN_WORKERS", min((os.cpu_count() or 1) * 2 + 1, 8))
+    )
+    available = int(os.environ.get("DB_MAX_CONNECTIONS", 100)) - int(
+        os.environ.get("DB_RESERVED_CONNECTIONS", 40)
+    )
+    return max(available // workers - 1, 2)
+
+
 class Config:
     """Enterprise Configuration Management"""
 
     SECRET_KEY = secrets.token_hex(32)
-    SQLALCHEMY_DATABASE_URI = "sqlite:///phantom_banking_enterprise.db"
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL", "sqlite:///phantom_banking_enterprise.db"
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {"query_cache_size": 1200}
+    if SQLALCHEMY_DATABASE_URI.startswith("postgresql"):
+        # psycopg2 fast execution helpers for executemany() INSERT/UPDATE
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+            executemany_batch_page_size=500,
+        )
+    if not SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        # Connection pool per worker process; DB_POOL_SIZE/DB_MAX_OVERFLOW
+        # override the worker's share of the server's connections
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            pool_size=int(os.environ.get("DB_POOL_SIZE", _pool_share() // 2)),
+            max_overflow=int(
+                os.environ.get("DB_MAX_OVERFLOW", _pool_share() - _pool_share() // 2)
+            ),
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+    SEND_FILE_MAX_AGE_DEFAULT = 31536000  # Static assets are content-versioned
+    # Compiled template bytecode; defaults to <instance>/jinja_cache
+    JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR")
     API_TITLE = "FNB Phantom Banking API"
     API_VERSION = "1.0"
     API_DESCRIPTION = "Banking-as-a-Service Platform for Financial Inclusion"
@@ -66,17 +133,65 @@ class Config:
     DEFAULT_MONTHLY_LIMIT = 50000.0
     MIN_TRANSACTION_AMOUNT = 1.0
     MAX_TRANSACTION_AMOUNT = 100000.0
+    MAX_BULK_ITEMS = 500
+
+    # Seconds that system-wide dashboard metrics may be served from cache
+    METRICS_CACHE_TTL = int(os.environ.get("METRICS_CACHE_TTL", 10))
+    # Upper bound on business dashboard staleness. Writes invalidate it sooner in
+    # every worker on Postgres, but only in the writing process elsewhere
+    DASHBOARD_CACHE_TTL = int(os.environ.get("DASHBOARD_CACHE_TTL", 30))
+    DASHBOARD_PAGE_SIZE = 25  # Wallets per page of the dashboard table
 
     # FNB Integration Settings
     FNB_API_BASE_URL = "https://api.fnb.co.za/v1"  # Mock
     FNB_WEBHOOK_URL = "https://webhook.fnb.co.za/phantom"  # Mock
 
+    # Response compression (Flask-Compress)
+    COMPRESS_ALGORITHM = ["br", "gzip"]
+    COMPRESS_LEVEL = 6
+    COMPRESS_BR_LEVEL = 4
+    COMPRESS_MIN_SIZE = 500
+    # Flask-Compress buffers a streamed response whole before compressing it,
+    # which would undo stream_template; those pages are compressed by the proxy
+    COMPRESS_STREAMS = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C encoder"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
+Compress(app)
+
+# Compiled templates persist on disk, so restarted workers skip recompiling them
+_jinja_cache_dir = app.config["JINJA_CACHE_DIR"] or os.path.join(
+    app.instance_path, "jinja_cache"
+)
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
 
 db = SQLAlchemy(app)
 
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets dashboard reads proceed while a payment write is in progress"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # API Documentation Setup
 api = Api(
     app,
@@ -87,6 +202,63 @@ api = Api(
     prefix="/api/v1",
 )
 
+
+@api.representation("application/json")
+def output_json(data, code, headers=None):
+    """Serialize RESTx resource responses with the app's orjson provider"""
+    resp = make_response(app.json.dumps(data), code)
+    resp.headers.extend(headers or {})
+    return resp
+
+
+# ==========================================
+# IN-PROCESS CACHING
+# ==========================================
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Business dashboard state: (validator, page count) keyed by business id, which
+# wallet and payment writes invalidate, and each page's payload (query results
+# as plain values) keyed by (business id, validator, page)
+dashboard_cache = TTLCache(maxsize=1_000, ttl=Config.DASHBOARD_CACHE_TTL)
+
+
 # ==========================================
 # ENUMS AND VALUE OBJECTS
 # ==========================================
@@ -126,6 +298,21 @@ class BusinessStatus(Enum):
     SUSPENDED = "suspended"
 
 
+# Dashboard status colours, looked up once per row when a payload is built
+WALLET_STATUS_COLORS = {
+    WalletStatus.ACTIVE: "#28a745",
+    WalletStatus.SUSPENDED: "#dc3545",
+    WalletStatus.UPGRADED: "#dc3545",
+    WalletStatus.CLOSED: "#dc3545",
+}
+TRANSACTION_STATUS_COLORS = {
+    TransactionStatus.PENDING: "#ffc107",
+    TransactionStatus.COMPLETED: "#28a745",
+    TransactionStatus.FAILED: "#ffc107",
+    TransactionStatus.CANCELLED: "#ffc107",
+}
+
+
 @dataclass
 class PaymentRequest:
     """Value object for payment requests"""
@@ -153,12 +340,34 @@ class FNBAccountDetails:
 # ==========================================
 
 
+def generate_uuid7() -> str:
+    """Generate a time-ordered UUIDv7 so new primary keys append to the index"""
+    unix_ts_ms = time.time_ns() // 1_000_000
+    rand = secrets.randbits(74)
+    value = (unix_ts_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 62) << 64  # rand_a
+    value |= 0b10 << 62  # variant
+    value |= rand & ((1 << 62) - 1)  # rand_b
+    return str(uuid.UUID(int=value))
+
+
+@lru_cache(maxsize=1)
+def _month_start(month: str) -> datetime:
+    return datetime.strptime(month, "%Y-%m")
+
+
+def current_month_start() -> datetime:
+    """Midnight on the first of the current UTC month, matching stored timestamps"""
+    return _month_start(datetime.utcnow().strftime("%Y-%m"))
+
+
 class BaseModel(db.Model):
     """Abstract base model with common fields"""
 
     __abstract__ = True
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid7)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -170,6 +379,15 @@ class Business(BaseModel):
     """Enhanced Business Entity"""
 
     __tablename__ = "businesses"
+    __table_args__ = (
+        # Partial index: COUNT of active businesses walks only the active rows
+        db.Index(
+            "ix_businesses_active",
+            "is_active",
+            postgresql_where=db.text("is_active"),
+            sqlite_where=db.text("is_active"),
+        ),
+    )
 
     # Core Information
     name = db.Column(db.String(100), nullable=False)
@@ -199,20 +417,20 @@ class Business(BaseModel):
     api_keys = db.relationship("APIKey", backref="business", lazy=True)
     audit_logs = db.relationship("AuditLog", backref="business", lazy=True)
 
-    # Business Metrics (for FNB KPIs)
-    total_deposit_volume = db.Column(db.Float, default=0.0)  # Key FNB Metric
-    total_transaction_count = db.Column(db.Integer, default=0)  # Key FNB Metric
-    monthly_active_wallets = db.Column(db.Integer, default=0)
+    # Business Metrics (for FNB KPIs) are summed from business_daily_metrics by
+    # the caller, once for a whole listing rather than once per business
 
-    def to_dict(self):
+    def to_dict(
+        self, total_deposit_volume: float = 0.0, total_transaction_count: int = 0
+    ):
         return {
             "id": self.id,
             "name": self.name,
             "email": self.email,
             "phone": self.phone,
             "status": self.status.value,
-            "total_deposit_volume": self.total_deposit_volume,
-            "total_transaction_count": self.total_transaction_count,
+            "total_deposit_volume": total_deposit_volume,  # Key FNB Metric
+            "total_transaction_count": total_transaction_count,  # Key FNB Metric
             "created_at": self.created_at.isoformat(),
         }
 
@@ -221,6 +439,19 @@ class PhantomWallet(BaseModel):
     """Enhanced Phantom Wallet Entity"""
 
     __tablename__ = "phantom_wallets"
+    __table_args__ = (
+        # Serves the per-business active wallet listing and counts
+        db.Index("ix_phantom_wallets_business_active", "business_id", "is_active"),
+        # Dashboard wallet counts split by status for one business
+        db.Index("ix_phantom_wallets_business_status", "business_id", "status"),
+        # Partial index for the system-wide active wallet count
+        db.Index(
+            "ix_phantom_wallets_active",
+            "is_active",
+            postgresql_where=db.text("is_active"),
+            sqlite_where=db.text("is_active"),
+        ),
+    )
 
     # Core Information
     business_id = db.Column(
@@ -238,7 +469,7 @@ class PhantomWallet(BaseModel):
 
     # Status and Access
     status = db.Column(db.Enum(WalletStatus), default=WalletStatus.ACTIVE)
-    ussd_code = db.Column(db.String(10), unique=True)
+    ussd_code = db.Column(db.String(10), unique=True, index=True)
     pin_hash = db.Column(db.String(255))  # For secure access
 
     # Activity Tracking
@@ -269,32 +500,32 @@ class PhantomWallet(BaseModel):
             if not PhantomWallet.query.filter_by(ussd_code=code).first():
                 return code
 
+    @staticmethod
+    def _generate_ussd_codes(count: int) -> List[str]:
+        """Generate a batch of unique USSD codes, one lookup per round"""
+        codes: set = set()
+        while len(codes) < count:
+            candidates = {
+                f"*{secrets.randbelow(9999):04d}#" for _ in range(count - len(codes))
+            } - codes
+            taken = set(
+                db.session.scalars(
+                    select(PhantomWallet.ussd_code).where(
+                        PhantomWallet.ussd_code.in_(candidates)
+                    )
+                )
+            )
+            codes |= candidates - taken
+        return list(codes)
+
     def check_limits(self, amount: float) -> tuple[bool, str]:
         """Check transaction limits"""
-        today = datetime.now().date()
-        this_month = datetime.now().replace(day=1).date()
-
-        daily_total = (
-            db.session.query(db.func.sum(Transaction.amount))
-            .filter(
-                Transaction.wallet_id == self.id,
-                db.func.date(Transaction.timestamp) == today,
-                Transaction.status == TransactionStatus.COMPLETED,
-            )
-            .scalar()
-            or 0
-        )
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
 
-        monthly_total = (
-            db.session.query(db.func.sum(Transaction.amount))
-            .filter(
-                Transaction.wallet_id == self.id,
-                db.func.date(Transaction.timestamp) >= this_month,
-                Transaction.status == TransactionStatus.COMPLETED,
-            )
-            .scalar()
-            or 0
-        )
+        daily_total, monthly_total = db.session.execute(
+            _WALLET_LIMIT_TOTALS,
+            {"wid": self.id, "today": today, "month_start": today.replace(day=1)},
+        ).one()
 
         if daily_total + amount > self.daily_limit:
             return (
@@ -331,10 +562,27 @@ class Transaction(BaseModel):
     """Enhanced Transaction Entity"""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Covers system-wide completed count/volume and monthly windows, so the
+        # aggregates are answered from the index alone
+        db.Index("ix_transactions_status_ts_amount", "status", "timestamp", "amount"),
+        # The one per-wallet index, kept to one since payments write every
+        # index: newest-first transactions for the dashboard without a sort,
+        # and a range scan of the index alone for today's count/volume and for
+        # check_limits' month, which filters status from the index. Also serves
+        # the wallet_id foreign key
+        db.Index(
+            "ix_transactions_wallet_ts_status",
+            "wallet_id",
+            db.text("timestamp DESC"),
+            "status",
+            "amount",
+        ),
+    )
 
     # Core Transaction Data
     wallet_id = db.Column(
-        db.String(36), db.ForeignKey("phantom_wallets.id"), nullable=False, index=True
+        db.String(36), db.ForeignKey("phantom_wallets.id"), nullable=False
     )
     amount = db.Column(db.Float, nullable=False)
     type = db.Column(db.Enum(TransactionType), nullable=False)
@@ -364,7 +612,8 @@ class Transaction(BaseModel):
         if not self.reference:
             self.reference = self._generate_reference()
 
-    def _generate_reference(self) -> str:
+    @staticmethod
+    def _generate_reference() -> str:
         """Generate unique transaction reference"""
         timestamp = int(time.time())
         random_part = secrets.randbelow(999999)
@@ -387,6 +636,25 @@ class Transaction(BaseModel):
         }
 
 
+# Module-level so the compiled SQL is reused from the engine's query cache
+_WALLET_LIMIT_TOTALS = select(
+    db.func.coalesce(
+        db.func.sum(
+            case(
+                (Transaction.timestamp >= bindparam("today"), Transaction.amount),
+                else_=0.0,
+            )
+        ),
+        0.0,
+    ),
+    db.func.coalesce(db.func.sum(Transaction.amount), 0.0),
+).where(
+    Transaction.wallet_id == bindparam("wid"),
+    Transaction.status == TransactionStatus.COMPLETED,
+    Transaction.timestamp >= bindparam("month_start"),
+)
+
+
 class APIKey(BaseModel):
     """API Key Management"""
 
@@ -428,6 +696,20 @@ class AuditLog(BaseModel):
     flagged = db.Column(db.Boolean, default=False)
 
 
+class BusinessDailyMetric(db.Model):
+    """Per-business daily KPI rollup of completed transactions, read by analytics"""
+
+    __tablename__ = "business_daily_metrics"
+
+    # Composite key doubles as the unique (business_id, day) index
+    business_id = db.Column(
+        db.String(36), db.ForeignKey("businesses.id"), primary_key=True
+    )
+    day = db.Column(db.Date, primary_key=True)
+    volume = db.Column(db.Float, default=0.0, nullable=False)
+    transaction_count = db.Column(db.Integer, default=0, nullable=False)
+
+
 # ==========================================
 # BUSINESS SERVICES (Domain Logic)
 # ==========================================
@@ -441,7 +723,7 @@ class PaymentProcessor:
         """Process payment with full validation and logging"""
         try:
             # Validate wallet
-            wallet = PhantomWallet.query.get(payment_request.wallet_id)
+            wallet = db.session.get(PhantomWallet, payment_request.wallet_id)
             if not wallet:
                 return {
                     "success": False,
@@ -495,10 +777,16 @@ class PaymentProcessor:
             wallet.last_activity = datetime.utcnow()
             wallet.last_transaction_id = transaction.id
 
-            # Update business metrics (KEY FNB METRICS)
-            business = wallet.business
-            business.total_deposit_volume += payment_request.amount
-            business.total_transaction_count += 1
+            # Business KPIs are rolled up by MetricsService, not per payment
+
+            # Read before the commits below expire the rows
+            business_id = wallet.business_id
+            delta = {
+                "type": "payment",
+                "wallet_id": wallet.id,
+                "amount": transaction.amount,
+                "balance": wallet.balance,
+            }
 
             # Save transaction
             db.session.add(transaction)
@@ -507,11 +795,13 @@ class PaymentProcessor:
             # Mark transaction as completed
             transaction.status = TransactionStatus.COMPLETED
             transaction.completed_at = datetime.utcnow()
+            dashboard_events.notify_workers(business_id, delta)
             db.session.commit()
+            dashboard_events.announce(business_id, delta)
 
             # Log the transaction
             AuditLogger.log_transaction(
-                business.id,
+                business_id,
                 "payment_processed",
                 transaction.id,
                 {
@@ -530,6 +820,12 @@ class PaymentProcessor:
                 "reference": transaction.reference,
                 "new_balance": wallet.balance,
                 "timestamp": transaction.timestamp.isoformat(),
+                # Display strings, so clients need no locale formatting
+                "formatted_amount": f"{transaction.amount:,.2f}",
+                "formatted_balance": f"{wallet.balance:,.2f}",
+                "formatted_timestamp": transaction.timestamp.strftime(
+                    "%d %b %Y %H:%M UTC"
+                ),
             }
 
         except Exception as e:
@@ -575,8 +871,11 @@ class WalletService:
                 ),
             )
 
+            delta = {"type": "wallets", "count": 1}
             db.session.add(wallet)
+            dashboard_events.notify_workers(business_id, delta)
             db.session.commit()
+            dashboard_events.announce(business_id, delta)
 
             # Log creation
             AuditLogger.log_action(
@@ -596,11 +895,88 @@ class WalletService:
             db.session.rollback()
             return {"success": False, "error": f"Creation error: {str(e)}"}
 
+    @staticmethod
+    def create_wallets(business_id: str, customers: List[Dict]) -> Dict[str, Any]:
+        """Create a batch of phantom wallets with one INSERT and one commit"""
+        try:
+            business = db.session.get(Business, business_id)
+            if not business or business.status != BusinessStatus.ACTIVE:
+                return {"success": False, "error": "Business not found or inactive"}
+
+            phones = [customer["phone"] for customer in customers]
+            if len(set(phones)) != len(phones):
+                return {"success": False, "error": "Duplicate customer phone in batch"}
+
+            existing = db.session.scalars(
+                select(PhantomWallet.customer_phone).where(
+                    PhantomWallet.business_id == business_id,
+                    PhantomWallet.customer_phone.in_(phones),
+                )
+            ).all()
+            if existing:
+                return {
+                    "success": False,
+                    "error": "Customers already have wallets with this business: "
+                    + ", ".join(existing),
+                }
+
+            rows = [
+                {
+                    "id": generate_uuid7(),
+                    "business_id": business_id,
+                    "customer_name": customer["name"],
+                    "customer_phone": customer["phone"],
+                    "customer_email": customer.get("email"),
+                    "daily_limit": customer.get(
+                        "daily_limit", Config.DEFAULT_DAILY_LIMIT
+                    ),
+                    "ussd_code": ussd_code,
+                }
+                for customer, ussd_code in zip(
+                    customers, PhantomWallet._generate_ussd_codes(len(customers))
+                )
+            ]
+
+            delta = {"type": "wallets", "count": len(rows)}
+            db.session.bulk_insert_mappings(PhantomWallet, rows)
+            dashboard_events.notify_workers(business_id, delta)
+            db.session.commit()
+            dashboard_events.announce(business_id, delta)
+
+            # Log creation
+            AuditLogger.log_action(
+                business_id,
+                "wallets_bulk_created",
+                "wallet",
+                None,
+                {"count": len(rows), "wallet_ids": [row["id"] for row in rows]},
+            )
+
+            return {
+                "success": True,
+                "wallets": [
+                    {
+                        "id": row["id"],
+                        "customer_name": row["customer_name"],
+                        "customer_phone": row["customer_phone"],
+                        "balance": 0.0,
+                        "status": WalletStatus.ACTIVE.value,
+                        "ussd_code": row["ussd_code"],
+                        "daily_limit": row["daily_limit"],
+                    }
+                    for row in rows
+                ],
+            }
+
+        except Exception as e:
+            db.session.rollback()
+            return {"success": False, "error": f"Creation error: {str(e)}"}
+
     @staticmethod
     def upgrade_to_fnb_account(wallet_id: str) -> Dict[str, Any]:
         """Upgrade phantom wallet to full FNB account"""
         try:
-            wallet = PhantomWallet.query.get(wallet_id)
+            wallet = db.session.get(PhantomWallet, wallet_id)
             if not wallet:
                 return {"success": False, "error": "Wallet not found"}
 
@@ -645,6 +1021,319 @@ class WalletService:
             return {"success": False, "error": f"Upgrade error: {str(e)}"}
 
 
+class MetricsService:
+    """Background KPI rollups that keep aggregate writes off the payment path"""
+
+    REFRESH_INTERVAL_SECONDS = 60
+    # Days recomputed by each refresh. Payments complete moments after they are
+    # stamped, so only a day that has just ended can still change
+    REFRESH_DAYS = 2
+
+    # Set in processes whose rollup another process keeps fresh, e.g. gunicorn
+    # workers that did not take the jobs lock
+    refreshed_elsewhere = False
+    _refresher_started = False
+    # time.monotonic() of this process's last refresh on read
+    _last_refresh: Optional[float] = None
+    _refresh_lock = threading.Lock()
+
+    @staticmethod
+    def refresh_business_daily_metrics(full: bool = False):
+        """Rebuild the rollup for recent days, or for every day when full"""
+        day = db.func.date(Transaction.timestamp)
+        rollup = (
+            select(
+                PhantomWallet.business_id,
+                day,
+                db.func.sum(Transaction.amount),
+                db.func.count(Transaction.id),
+            )
+            .select_from(Transaction)
+            .join(PhantomWallet, PhantomWallet.id == Transaction.wallet_id)
+            .where(Transaction.status == TransactionStatus.COMPLETED)
+            .group_by(PhantomWallet.business_id, day)
+        )
+        table = BusinessDailyMetric.__table__
+        # The refreshed days are cleared first, so a day whose completed
+        # transactions have all gone loses its row
+        delete = table.delete()
+        if not full:
+            since = datetime.utcnow().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ) - timedelta(days=MetricsService.REFRESH_DAYS - 1)
+            rollup = rollup.where(Transaction.timestamp >= since)
+            delete = delete.where(table.c.day >= since.date())
+
+        columns = ["business_id", "day", "volume", "transaction_count"]
+        try:
+            db.session.execute(delete)
+            # The upsert keeps a refresh running alongside this one from
+            # failing on the primary key; without ON CONFLICT it is a plain insert
+            dialect_insert = _UPSERT_INSERTS.get(db.engine.dialect.name)
+            if dialect_insert is not None:
+                upsert = dialect_insert(table).from_select(columns, rollup)
+                db.session.execute(
+                    upsert.on_conflict_do_update(
+                        index_elements=["business_id", "day"],
+                        set_={
+                            "volume": upsert.excluded.volume,
+                            "transaction_count": upsert.excluded.transaction_count,
+                        },
+                    )
+                )
+            else:
+                db.session.execute(table.insert().from_select(columns, rollup))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Metrics refresh error: {e}")
+
+    @staticmethod
+    def ensure_fresh():
+        """Refresh before a read when no background refresher keeps the rollup up"""
+        if MetricsService.refreshed_elsewhere or MetricsService._refresher_started:
+            return
+        last_refresh = MetricsService._last_refresh
+        if (
+            last_refresh is not None
+            and time.monotonic() - last_refresh
+            < MetricsService.REFRESH_INTERVAL_SECONDS
+        ):
+            return
+        # The first read waits for the backfill; later readers that find a
+        # refresh under way serve the current rollup instead of queuing
+        if not MetricsService._refresh_lock.acquire(blocking=last_refresh is None):
+            return
+        try:
+            # Skip if another reader refreshed while this one waited
+            if MetricsService._last_refresh == last_refresh:
+                MetricsService.refresh_business_daily_metrics(full=last_refresh is None)
+                MetricsService._last_refresh = time.monotonic()
+        finally:
+            MetricsService._refresh_lock.release()
+
+    @staticmethod
+    def start_refresher():
+        """Refresh the rollup on a fixed interval in a daemon thread"""
+        MetricsService._refresher_started = True
+
+        def _run():
+            # The first pass backfills every day, e.g. for a new rollup table
+            full = True
+            while True:
+                with app.app_context():
+                    MetricsService.refresh_business_daily_metrics(full)
+                full = False
+                time.sleep(MetricsService.REFRESH_INTERVAL_SECONDS)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+
+class APIKeyUsageTracker:
+    """Accumulates API key usage in memory and writes it back in batches"""
+
+    FLUSH_INTERVAL_SECONDS = 10
+
+    _UPDATE = (
+        APIKey.__table__.update()
+        .where(APIKey.__table__.c.id == bindparam("key_id"))
+        .values(
+            usage_count=db.func.coalesce(APIKey.__table__.c.usage_count, 0)
+            + bindparam("uses"),
+            last_used=bindparam("used_at"),
+        )
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List] = {}
+
+    def bump(self, key_id: str):
+        """Record one authenticated request for an API key"""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._pending.setdefault(key_id, [0, now])
+            entry[0] += 1
+            entry[1] = now
+
+    def flush(self):
+        """Apply all pending usage in a single batched UPDATE"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        try:
+            db.session.execute(
+                self._UPDATE,
+                [
+                    {"key_id": key_id, "uses": uses, "used_at": used_at}
+                    for key_id, (uses, used_at) in pending.items()
+                ],
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"API key usage flush error: {e}")
+
+    def start_flusher(self):
+        """Flush pending usage on a fixed interval in a daemon thread"""
+
+        def _run():
+            while True:
+                time.sleep(self.FLUSH_INTERVAL_SECONDS)
+                with app.app_context():
+                    self.flush()
+
+        threading.Thread(target=_run, daemon=True).start()
+
+
+usage_tracker = APIKeyUsageTracker()
+
+
+class BackgroundTasks:
+    """Bounded worker pool that runs post-commit side effects off the request"""
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="side-effects"
+        )
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn in a worker thread inside its own app context"""
+
+        def _run():
+            with app.app_context():
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    print(f"Background task error: {e}")
+
+        return self._executor.submit(_run)
+
+
+background_tasks = BackgroundTasks()
+
+
+class DashboardEvents:
+    """
+    Fan-out of dashboard deltas to per-business SSE subscribers
+
+    Subscribers and cached dashboards live in each worker's memory. A write
+    calls notify_workers before its commit and announce after it. On Postgres
+    the first sends a NOTIFY with the write's transaction, and each other
+    worker's listener announces the change locally. Other databases have no
+    channel between processes, so there a change reaches only the worker that
+    made it; the rest serve their cached dashboard for up to
+    DASHBOARD_CACHE_TTL and push no delta.
+    """
+
+    KEEPALIVE_SECONDS = 15
+    CHANNEL = "phantom_dashboard"
+    RECONNECT_SECONDS = 5
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[queue.Queue]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, business_id: str) -> queue.Queue:
+        subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            self._subscribers[business_id].append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, business_id: str, subscriber: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(business_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(business_id, None)
+
+    def notify_workers(self, business_id: str, delta: Dict[str, Any]):
+        """Queue a change for the other workers; sent when the session commits"""
+        if db.engine.dialect.name != "postgresql":
+            return
+
+        payload = json.dumps(
+            {"pid": os.getpid(), "business_id": business_id, "delta": delta}
+        )
+        db.session.execute(select(db.func.pg_notify(self.CHANNEL, payload)))
+
+    def announce(self, business_id: str, delta: Dict[str, Any]):
+        """Invalidate and publish a committed change in this worker"""
+        dashboard_cache.invalidate(business_id)
+        self.publish(business_id, delta)
+
+    def publish(self, business_id: str, delta: Dict[str, Any]):
+        """Queue a delta for every open dashboard of the business"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(business_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(delta)
+            except queue.Full:
+                pass  # A stalled client misses deltas rather than blocking writes
+
+    def stream(self, business_id: str):
+        """Yield SSE frames until the client disconnects"""
+        subscriber = self.subscribe(business_id)
+        try:
+            while True:
+                try:
+                    delta = subscriber.get(timeout=self.KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(delta)}\n\n"
+        finally:
+            self.unsubscribe(business_id, subscriber)
+
+    def start_listener(self):
+        """Apply other workers' announced changes in a daemon thread (Postgres)"""
+        if db.engine.dialect.name != "postgresql":
+            return
+
+        def _run():
+            while True:
+                try:
+                    with app.app_context():
+                        self._listen()
+                except Exception as e:
+                    print(f"Dashboard listener error: {e}")
+                # Changes missed while reconnecting age out with the cache TTL
+                time.sleep(self.RECONNECT_SECONDS)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _listen(self):
+        # A dedicated connection outside the pool, since LISTEN holds it forever
+        connection = db.engine.raw_connection()
+        connection.detach()
+        try:
+            listener = connection.driver_connection
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.CHANNEL}")
+            while True:
+                ready, _, _ = select_module.select(
+                    [listener], [], [], self.KEEPALIVE_SECONDS
+                )
+                if not ready:
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    message = json.loads(listener.notifies.pop(0).payload)
+                    # The announcing worker has already applied its own change
+                    if message["pid"] != os.getpid():
+                        self.announce(message["business_id"], message["delta"])
+        finally:
+            connection.close()
+
+
+dashboard_events = DashboardEvents()
+
+
 class AuditLogger:
     """Centralized Audit Logging Service"""
 
@@ -656,20 +1345,43 @@ class AuditLogger:
         resource_id: str,
         details: Dict,
     ):
-        """Log business action"""
+        """Log business action (written by a background worker)"""
+        # Capture request metadata here; the worker has no request context
+        background_tasks.submit(
+            AuditLogger._write,
+            business_id,
+            action,
+            resource_type,
+            resource_id,
+            json.dumps(details),
+            request.remote_addr if request else None,
+            request.user_agent.string if request else None,
+        )
+
+    @staticmethod
+    def _write(
+        business_id: str,
+        action: str,
+        resource_type: str,
+        resource_id: str,
+        details: str,
+        ip_address: Optional[str],
+        user_agent: Optional[str],
+    ):
         try:
             log = AuditLog(
                 business_id=business_id,
                 action=action,
                 resource_type=resource_type,
                 resource_id=resource_id,
-                details=json.dumps(details),
-                ip_address=request.remote_addr if request else None,
-                user_agent=request.user_agent.string if request else None,
+                details=details,
+                ip_address=ip_address,
+                user_agent=user_agent,
             )
             db.session.add(log)
             db.session.commit()
         except Exception as e:
+            db.session.rollback()
             print(f"Audit logging error: {e}")
 
     @staticmethod
@@ -713,9 +1425,7 @@ class FNBIntegrationService:
         }
 
         # Simulate async notification
-        threading.Thread(
-            target=FNBIntegrationService._send_webhook, args=(notification_data,)
-        ).start()
+        background_tasks.submit(FNBIntegrationService._send_webhook, notification_data)
 
     @staticmethod
     def _send_webhook(data: Dict):
@@ -739,6 +1449,14 @@ api.add_namespace(wallet_ns)
 api.add_namespace(payment_ns)
 api.add_namespace(business_ns)
 
+
+class EnumValue(fields.String):
+    """String field that renders Enum members by their value"""
+
+    def format(self, value):
+        return super().format(value.value if isinstance(value, Enum) else value)
+
+
 # API Models for Documentation
 wallet_model = api.model(
     "Wallet",
@@ -747,7 +1465,7 @@ wallet_model = api.model(
         "customer_name": fields.String(description="Customer name"),
         "customer_phone": fields.String(description="Customer phone number"),
         "balance": fields.Float(description="Current balance"),
-        "status": fields.String(description="Wallet status"),
+        "status": EnumValue(description="Wallet status"),
         "ussd_code": fields.String(description="USSD access code"),
     },
 )
@@ -777,7 +1495,27 @@ transaction_model = api.model(
 )
 
 
+class CompiledMarshaller:
+    """Marshals with a model's fields resolved once instead of per response"""
+
+    def __init__(self, model):
+        self._fields = tuple(model.items())
+
+    def __call__(self, obj) -> Dict[str, Any]:
+        return {name: field.output(name, obj) for name, field in self._fields}
+
+    def many(self, objs) -> List[Dict[str, Any]]:
+        return [self(obj) for obj in objs]
+
+
+marshal_wallet = CompiledMarshaller(wallet_model)
+
+
 # Authentication decorator
+# Raw bearer token -> (api key id, business id); revoke with invalidate(token)
+api_key_cache = TTLCache(maxsize=10_000, ttl=60)
+
+
 def require_api_key(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -787,18 +1525,27 @@ def require_api_key(f):
 
         api_key = auth_header.replace("Bearer ", "")
 
-        # Validate API key
-        key_obj = APIKey.query.filter_by(key=api_key, is_active=True).first()
-        if not key_obj:
-            return {"error": "Invalid API key"}, 401
+        # Validate API key (cached as plain ids, never as ORM objects); a hit
+        # authenticates without touching the database
+        cached = api_key_cache.get(api_key)
+        if cached is None:
+            cached = (
+                db.session.query(APIKey.id, APIKey.business_id)
+                .filter_by(key=api_key, is_active=True)
+                .first()
+            )
+            if not cached:
+                return {"error": "Invalid API key"}, 401
+
+            cached = tuple(cached)
+            api_key_cache.set(api_key, cached)
 
-        # Update usage
-        key_obj.last_used = datetime.utcnow()
-        key_obj.usage_count += 1
-        db.session.commit()
+        # Add business context; handlers load the Business row only if they need it
+        request.business_id = cached[1]
+
+        # Record usage; written back in batches off the request path
+        usage_tracker.bump(cached[0])
 
-        # Add business context
-        request.business = key_obj.business
         return f(*args, **kwargs)
 
     return decorated_function
@@ -808,14 +1555,25 @@ def require_api_key(f):
 @wallet_ns.route("/")
 class WalletList(Resource):
     @wallet_ns.doc("list_wallets")
-    @wallet_ns.marshal_list_with(wallet_model)
+    @wallet_ns.response(200, "Success", [wallet_model])
     @require_api_key
     def get(self):
         """List all wallets for the authenticated business"""
-        wallets = PhantomWallet.query.filter_by(
-            business_id=request.business.id, is_active=True
-        ).all()
-        return [wallet.to_dict() for wallet in wallets]
+        # Select only the wallet_model columns; rows are marshalled directly
+        return marshal_wallet.many(
+            db.session.execute(
+                select(
+                    PhantomWallet.id,
+                    PhantomWallet.customer_name,
+                    PhantomWallet.customer_phone,
+                    PhantomWallet.balance,
+                    PhantomWallet.status,
+                    PhantomWallet.ussd_code,
+                ).filter_by(business_id=request.business_id, is_active=True)
+            )
+            .mappings()
+            .all()
+        )
 
     @wallet_ns.doc("create_wallet")
     @wallet_ns.expect(
@@ -832,28 +1590,47 @@ class WalletList(Resource):
     @require_api_key
     def post(self):
         """Create a new phantom wallet"""
-        result = WalletService.create_wallet(request.business.id, request.json)
+        result = WalletService.create_wallet(request.business_id, request.json)
         if result["success"]:
             return result["wallet"], 201
         else:
             return {"error": result["error"]}, 400
 
 
+@wallet_ns.route("/bulk")
+class WalletBulkCreate(Resource):
+    @wallet_ns.doc("create_wallets_bulk")
+    @require_api_key
+    def post(self):
+        """Create up to MAX_BULK_ITEMS phantom wallets in one request"""
+        customers = (request.json or {}).get("wallets") or []
+        if not customers or len(customers) > Config.MAX_BULK_ITEMS:
+            return {
+                "error": f"Provide between 1 and {Config.MAX_BULK_ITEMS} wallets"
+            }, 400
+
+        result = WalletService.create_wallets(request.business_id, customers)
+        if result["success"]:
+            return {"wallets": result["wallets"]}, 201
+        else:
+            return {"error": result["error"]}, 400
+
+
 @wallet_ns.route("/<string:wallet_id>")
 class WalletDetail(Resource):
     @wallet_ns.doc("get_wallet")
-    @wallet_ns.marshal_with(wallet_model)
+    @wallet_ns.response(200, "Success", wallet_model)
     @require_api_key
     def get(self, wallet_id):
         """Get wallet details"""
         wallet = PhantomWallet.query.filter_by(
-            id=wallet_id, business_id=request.business.id
+            id=wallet_id, business_id=request.business_id
         ).first()
 
         if not wallet:
             return {"error": "Wallet not found"}, 404
 
-        return wallet.to_dict()
+        return marshal_wallet(wallet)
 
 
 @wallet_ns.route("/<string:wallet_id>/upgrade")
@@ -879,12 +1656,13 @@ class PaymentProcess(Resource):
     def post(self):
         """Process a payment to a phantom wallet"""
         try:
+            data = request.get_json()
             payment_request = PaymentRequest(
-                wallet_id=request.json["wallet_id"],
-                amount=float(request.json["amount"]),
-                method=PaymentMethod(request.json["method"]),
-                description=request.json["description"],
-                source_info=request.json.get("source_info"),
+                wallet_id=data["wallet_id"],
+                amount=float(data["amount"]),
+                method=PaymentMethod(data["method"]),
+                description=data["description"],
+                source_info=data.get("source_info"),
             )
 
             result = PaymentProcessor.process_payment(payment_request)
@@ -898,17 +1676,55 @@ class PaymentProcess(Resource):
             return {"error": f"Invalid request: {str(e)}"}, 400
 
 
+@payment_ns.route("/bulk")
+class PaymentBulkProcess(Resource):
+    @payment_ns.doc("process_payments_bulk")
+    @require_api_key
+    def post(self):
+        """Process up to MAX_BULK_ITEMS payments in one request"""
+        payments = (request.json or {}).get("payments") or []
+        if not payments or len(payments) > Config.MAX_BULK_ITEMS:
+            return {
+                "error": f"Provide between 1 and {Config.MAX_BULK_ITEMS} payments"
+            }, 400
+
+        # Each payment keeps its own limit checks and commit; a failure is
+        # reported per item rather than aborting the batch
+        results = []
+        for payment in payments:
+            try:
+                payment_request = PaymentRequest(
+                    wallet_id=payment["wallet_id"],
+                    amount=float(payment["amount"]),
+                    method=PaymentMethod(payment["method"]),
+                    description=payment["description"],
+                    source_info=payment.get("source_info"),
+                )
+            except Exception as e:
+                results.append({"success": False, "error": f"Invalid request: {e}"})
+                continue
+
+            results.append(PaymentProcessor.process_payment(payment_request))
+
+        return {
+            "processed": sum(1 for result in results if result["success"]),
+            "failed": sum(1 for result in results if not result["success"]),
+            "results": results,
+        }, 200
+
+
 @payment_ns.route("/qr")
 class QRPayment(Resource):
     @payment_ns.doc("qr_payment")
     @require_api_key
     def post(self):
         """Process QR code payment"""
+        data = request.get_json()
         payment_request = PaymentRequest(
-            wallet_id=request.json["wallet_id"],
-            amount=float(request.json["amount"]),
+            wallet_id=data["wallet_id"],
+            amount=float(data["amount"]),
             method=PaymentMethod.QR,
-            description=f"QR Payment - BWP {request.json['amount']}",
+            description=f"QR Payment - BWP {data['amount']}",
             source_info={"source": "qr_scan"},
         )
 
@@ -916,24 +1732,34 @@ class QRPayment(Resource):
         return result
 
 
+# USSD code -> wallet id; codes are stable for the life of a wallet
+ussd_cache = TTLCache(maxsize=50_000, ttl=300)
+
+
 @payment_ns.route("/ussd")
 class USSDPayment(Resource):
     @payment_ns.doc("ussd_payment")
     @require_api_key
     def post(self):
         """Process USSD payment"""
-        # Find wallet by USSD code
-        ussd_code = request.json["ussd_code"]
-        wallet = PhantomWallet.query.filter_by(ussd_code=ussd_code).first()
+        data = request.get_json()
 
-        if not wallet:
-            return {"error": "Invalid USSD code"}, 400
+        # Find wallet by USSD code
+        ussd_code = data["ussd_code"]
+        wallet_id = ussd_cache.get(ussd_code)
+        if wallet_id is None:
+            wallet_id = db.session.scalar(
+                select(PhantomWallet.id).filter_by(ussd_code=ussd_code)
+            )
+            if not wallet_id:
+                return {"error": "Invalid USSD code"}, 400
+            ussd_cache.set(ussd_code, wallet_id)
 
         payment_request = PaymentRequest(
-            wallet_id=wallet.id,
-            amount=float(request.json["amount"]),
+            wallet_id=wallet_id,
+            amount=float(data["amount"]),
             method=PaymentMethod.USSD,
-            description=f"USSD Payment - BWP {request.json['amount']}",
+            description=f"USSD Payment - BWP {data['amount']}",
             source_info={"source": "ussd", "code": ussd_code},
         )
 
@@ -948,57 +1774,71 @@ class BusinessAnalytics(Resource):
     @require_api_key
     def get(self):
         """Get business analytics and KPIs"""
-        business = request.business
-
-        # Calculate key metrics that FNB cares about
-        wallets = PhantomWallet.query.filter_by(business_id=business.id).all()
-
-        total_wallets = len(wallets)
-        active_wallets = len([w for w in wallets if w.status == WalletStatus.ACTIVE])
-        total_balance = sum(w.balance for w in wallets)
-
-        # Transaction metrics
-        all_transactions = (
-            Transaction.query.join(PhantomWallet)
-            .filter(PhantomWallet.business_id == business.id)
-            .all()
+        business_id = request.business_id
+
+        # Calculate key metrics that FNB cares about (aggregated in SQL)
+        total_wallets, active_wallets, total_balance = (
+            db.session.query(
+                db.func.count(PhantomWallet.id),
+                db.func.coalesce(
+                    db.func.sum(
+                        case((PhantomWallet.status == WalletStatus.ACTIVE, 1), else_=0)
+                    ),
+                    0,
+                ),
+                db.func.coalesce(db.func.sum(PhantomWallet.balance), 0.0),
+            )
+            .filter(PhantomWallet.business_id == business_id)
+            .one()
         )
 
-        completed_transactions = [
-            t for t in all_transactions if t.status == TransactionStatus.COMPLETED
-        ]
-        total_transaction_volume = sum(t.amount for t in completed_transactions)
-
-        # Monthly growth metrics
-        current_month = datetime.now().replace(day=1)
-        monthly_transactions = [
-            t for t in completed_transactions if t.timestamp >= current_month
-        ]
-        monthly_volume = sum(t.amount for t in monthly_transactions)
+        # Transaction metrics, including monthly growth, from the daily rollup
+        # (up to MetricsService.REFRESH_INTERVAL_SECONDS behind)
+        MetricsService.ensure_fresh()
+        in_month = BusinessDailyMetric.day >= current_month_start().date()
+        (
+            total_transaction_volume,
+            total_transaction_count,
+            monthly_volume,
+            monthly_transaction_count,
+        ) = (
+            db.session.query(
+                db.func.coalesce(db.func.sum(BusinessDailyMetric.volume), 0.0),
+                db.func.coalesce(db.func.sum(BusinessDailyMetric.transaction_count), 0),
+                db.func.coalesce(
+                    db.func.sum(
+                        case((in_month, BusinessDailyMetric.volume), else_=0.0)
+                    ),
+                    0.0,
+                ),
+                db.func.coalesce(
+                    db.func.sum(
+                        case((in_month, BusinessDailyMetric.transaction_count), else_=0)
+                    ),
+                    0,
+                ),
+            )
+            .filter(BusinessDailyMetric.business_id == business_id)
+            .one()
+        )
 
         return {
             "business_metrics": {
                 "total_wallets": total_wallets,
                 "active_wallets": active_wallets,
                 "total_deposit_volume": total_transaction_volume,  # KEY FNB METRIC
-                "total_transaction_count": len(
-                    completed_transactions
-                ),  # KEY FNB METRIC
+                "total_transaction_count": total_transaction_count,  # KEY FNB METRIC
                 "monthly_transaction_volume": monthly_volume,
-                "current_month_transactions": len(monthly_transactions),
+                "current_month_transactions": monthly_transaction_count,
                 "average_wallet_balance": total_balance / total_wallets
                 if total_wallets > 0
                 else 0,
             },
             "fnb_impact": {
                 "new_deposits_generated": total_transaction_volume,  # Direct FNB benefit
-                "new_transactions_processed": len(
-                    completed_transactions
-                ),  # Direct FNB benefit
+                "new_transactions_processed": total_transaction_count,  # Direct FNB benefit
                 "potential_new_customers": total_wallets,  # Onboarding pipeline
-                "digital_engagement_increase": len(
-                    monthly_transactions
-                ),  # Digital strategy alignment
+                "digital_engagement_increase": monthly_transaction_count,  # Digital strategy alignment
             },
         }
 
@@ -1007,512 +1847,158 @@ class BusinessAnalytics(Resource):
 # WEB INTERFACE (Enhanced)
 # ==========================================
 
-ENTERPRISE_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>FNB Phantom Banking - Enterprise Platform</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js"></script>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        body { 
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif; 
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: #333;
-            min-height: 100vh;
-        }
-        
-        .header { 
-            background: rgba(255,255,255,0.1); 
-            backdrop-filter: blur(20px);
-            border-bottom: 1px solid rgba(255,255,255,0.2);
-            padding: 20px; 
-            color: white;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-        }
-        
-        .header-content {
-            max-width: 1400px;
-            margin: 0 auto;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .logo {
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }
-        
-        .logo h1 { 
-            font-size: 2rem; 
-            font-weight: 700;
-            background: linear-gradient(135deg, #fff 0%, #e6f3ff 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }
-        
-        .nav-links {
-            display: flex;
-            gap: 20px;
-        }
-        
-        .nav-links a {
-            color: white;
-            text-decoration: none;
-            padding: 8px 16px;
-            border-radius: 20px;
-            transition: all 0.3s ease;
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255,255,255,0.2);
-        }
-        
-        .nav-links a:hover {
-            background: rgba(255,255,255,0.2);
-            transform: translateY(-2px);
-        }
-        
-        .container { 
-            max-width: 1400px; 
-            margin: 0 auto; 
-            padding: 30px;
-        }
-        
-        .hero-section {
-            text-align: center;
-            padding: 60px 0;
-            color: white;
-        }
-        
-        .hero-section h1 {
-            font-size: 3.5rem;
-            margin-bottom: 20px;
-            font-weight: 700;
-        }
-        
-        .hero-section p {
-            font-size: 1.3rem;
-            opacity: 0.9;
-            max-width: 800px;
-            margin: 0 auto 40px;
-            line-height: 1.6;
-        }
-        
-        .cta-buttons {
-            display: flex;
-            gap: 20px;
-            justify-content: center;
-            flex-wrap: wrap;
-        }
-        
-        .card { 
-            background: rgba(255,255,255,0.95); 
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255,255,255,0.3);
-            padding: 30px; 
-            margin: 20px 0; 
-            border-radius: 20px; 
-            box-shadow: 0 20px 60px rgba(0,0,0,0.1);
-            transition: all 0.4s ease;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-            transition: left 0.8s ease;
-        }
-        
-        .card:hover::before {
-            left: 100%;
-        }
-        
-        .card:hover { 
-            transform: translateY(-8px) scale(1.02); 
-            box-shadow: 0 30px 80px rgba(0,0,0,0.15);
-        }
-        
-        .btn { 
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white; 
-            padding: 15px 30px; 
-            border: none; 
-            border-radius: 50px; 
-            cursor: pointer; 
-            text-decoration: none; 
-            display: inline-block;
-            font-weight: 600;
-            font-size: 16px;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .btn:hover { 
-            transform: translateY(-3px);
-            box-shadow: 0 15px 35px rgba(30, 60, 114, 0.4);
-        }
-        
-        .btn-success { background: linear-gradient(135deg, #28a745 0%, #20c997 100%); }
-        .btn-warning { background: linear-gradient(135deg, #ffc107 0%, #fd7e14 100%); }
-        .btn-danger { background: linear-gradient(135deg, #dc3545 0%, #e83e8c 100%); }
-        
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 25px;
-            margin: 40px 0;
-        }
-        
-        .stat-card { 
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white; 
-            padding: 35px; 
-            border-radius: 20px; 
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-            transition: all 0.4s ease;
-        }
-        
-        .stat-card:hover {
-            transform: scale(1.05) rotate(1deg);
-        }
-        
-        .stat-number { 
-            font-size: 3rem; 
-            font-weight: 800; 
-            margin-bottom: 15px;
-            background: linear-gradient(135deg, #fff 0%, #e6f3ff 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }
-        
-        .stat-label { 
-            font-size: 1rem; 
-            opacity: 0.9;
-            font-weight: 500;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .grid { 
-            display: grid; 
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); 
-            gap: 30px; 
-        }
-        
-        .feature-card {
-            background: rgba(255,255,255,0.95);
-            border-radius: 20px;
-            padding: 40px;
-            text-align: center;
-            transition: all 0.4s ease;
-            border: 2px solid transparent;
-        }
-        
-        .feature-card:hover {
-            border-color: #2a5298;
-            transform: translateY(-10px);
-        }
-        
-        .feature-icon {
-            font-size: 4rem;
-            margin-bottom: 20px;
-        }
-        
-        .feature-card h3 {
-            font-size: 1.5rem;
-            margin-bottom: 15px;
-            color: #1e3c72;
-        }
-        
-        .alert { 
-            padding: 20px; 
-            margin: 20px 0; 
-            border-radius: 15px;
-            animation: slideIn 0.5s ease;
-            border-left: 5px solid;
-        }
-        
-        .alert-success { 
-            background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-            color: #155724; 
-            border-left-color: #28a745;
-        }
-        
-        @keyframes slideIn {
-            from { transform: translateX(-100%); opacity: 0; }
-            to { transform: translateX(0); opacity: 1; }
-        }
-        
-        .fnb-impact {
-            background: linear-gradient(135deg, #28a745 0%, #20c997 100%);
-            color: white;
-            padding: 40px;
-            border-radius: 20px;
-            margin: 30px 0;
-        }
-        
-        .fnb-impact h3 {
-            font-size: 2rem;
-            margin-bottom: 20px;
-            text-align: center;
-        }
-        
-        .impact-metrics {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-top: 30px;
-        }
-        
-        .impact-metric {
-            text-align: center;
-            padding: 20px;
-            background: rgba(255,255,255,0.1);
-            border-radius: 15px;
-        }
-        
-        .impact-number {
-            font-size: 2.5rem;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }
-        
-        @media (max-width: 768px) {
-            .header-content {
-                flex-direction: column;
-                gap: 20px;
-            }
-            
-            .hero-section h1 {
-                font-size: 2.5rem;
-            }
-            
-            .nav-links {
-                flex-wrap: wrap;
-                justify-content: center;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="header-content">
-            <div class="logo">
-                <div style="font-size: 2rem;">🏦</div>
-                <div>
-                    <h1>FNB Phantom Banking</h1>
-                    <p style="font-size: 0.9rem; opacity: 0.8;">Enterprise Banking-as-a-Service Platform</p>
-                </div>
-            </div>
-            <div class="nav-links">
-                <a href="/business/login">Business Portal</a>
-                <a href="/customer/pay">Customer Experience</a>
-                <a href="/api/docs/">API Documentation</a>
-                <a href="#analytics">Analytics</a>
-            </div>
-        </div>
-    </div>
-    
-    <div class="container">
-        {% with messages = get_flashed_messages() %}
-            {% if messages %}
-                {% for message in messages %}
-                    <div class="alert alert-success">{{ message }}</div>
-                {% endfor %}
-            {% endif %}
-        {% endwith %}
-        {{ content|safe }}
-    </div>
-</body>
-</html>
-"""
 
+@lru_cache(maxsize=None)
+def _asset_version(filename: str) -> str:
+    """Content hash of a static file, used to bust far-future caching"""
+    with open(os.path.join(app.static_folder, filename), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
 
-@app.route("/")
-def index():
-    """Enhanced homepage showcasing FNB alignment"""
 
-    # Get real-time system metrics
-    total_businesses = Business.query.filter_by(is_active=True).count()
-    total_wallets = PhantomWallet.query.filter_by(is_active=True).count()
-    total_transactions = Transaction.query.filter_by(
-        status=TransactionStatus.COMPLETED
-    ).count()
-    total_volume = (
-        db.session.query(db.func.sum(Transaction.amount))
-        .filter(Transaction.status == TransactionStatus.COMPLETED)
-        .scalar()
-        or 0
-    )
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """Versioned URL for a static asset"""
+    return url_for("static", filename=filename, v=_asset_version(filename))
 
-    # Calculate FNB-specific impact metrics
-    monthly_volume = (
-        db.session.query(db.func.sum(Transaction.amount))
-        .filter(
-            Transaction.status == TransactionStatus.COMPLETED,
-            Transaction.timestamp >= datetime.now().replace(day=1),
+
+@app.template_filter("number")
+def format_number(value, decimals: int = 0) -> str:
+    """Thousands-separated number, e.g. 12,345"""
+    return f"{value or 0:,.{decimals}f}"
+
+
+def static_page(view):
+    """Serve a page with no per-request data from HTML rendered and compressed once"""
+    rendered = {}
+
+    @wraps(view)
+    def decorated_function():
+        if not rendered:
+            html = view().encode("utf-8")
+            rendered.update(
+                br=brotli.compress(html, quality=11),
+                gzip=gzip.compress(html, compresslevel=9),
+                identity=html,
+            )
+
+        encoding = next(
+            (enc for enc in ("br", "gzip") if enc in request.accept_encodings),
+            "identity",
         )
-        .scalar()
-        or 0
+        response = Response(
+            rendered[encoding],
+            mimetype="text/html",
+            headers={
+                "Cache-Control": "public, max-age=3600",
+                "Vary": "Accept-Encoding",
+            },
+        )
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    return decorated_function
+
+
+# Dashboards poll these figures; a few seconds of staleness is acceptable
+_system_metrics_cache = TTLCache(maxsize=1, ttl=Config.METRICS_CACHE_TTL)
+
+
+def _system_metrics() -> Dict[str, Any]:
+    """System-wide KPIs, recomputed at most once per cache TTL"""
+    metrics = _system_metrics_cache.get("system")
+    if metrics is None:
+        metrics = _query_system_metrics()
+        _system_metrics_cache.set("system", metrics)
+    return metrics
+
+
+def _query_system_metrics() -> Dict[str, Any]:
+    """System-wide KPIs and the top businesses gathered in a single SQL round-trip"""
+    MetricsService.ensure_fresh()
+    this_month = BusinessDailyMetric.day >= current_month_start().date()
+
+    # Completed volume per business from the daily rollup; the totals and the
+    # leaderboard both read this CTE so adding per-business figures does not
+    # add queries
+    business_volume = (
+        select(
+            BusinessDailyMetric.business_id,
+            db.func.sum(BusinessDailyMetric.transaction_count).label("transactions"),
+            db.func.sum(BusinessDailyMetric.volume).label("volume"),
+            db.func.sum(
+                case((this_month, BusinessDailyMetric.volume), else_=0.0)
+            ).label("monthly_volume"),
+        )
+        .group_by(BusinessDailyMetric.business_id)
+        .cte("business_volume")
+    )
+    transaction_totals = select(
+        db.func.coalesce(db.func.sum(business_volume.c.transactions), 0).label(
+            "transactions"
+        ),
+        db.func.coalesce(db.func.sum(business_volume.c.volume), 0.0).label("volume"),
+        db.func.coalesce(db.func.sum(business_volume.c.monthly_volume), 0.0).label(
+            "monthly_volume"
+        ),
+    ).subquery()
+    top_businesses = (
+        select(Business.name, business_volume.c.volume)
+        .join(business_volume, business_volume.c.business_id == Business.id)
+        .order_by(business_volume.c.volume.desc())
+        .limit(3)
+        .subquery()
+    )
+    wallet_count = (
+        select(db.func.count(PhantomWallet.id))
+        .filter_by(is_active=True)
+        .scalar_subquery()
+    )
+    upgraded_count = (
+        select(db.func.count(PhantomWallet.id))
+        .filter_by(status=WalletStatus.UPGRADED)
+        .scalar_subquery()
+    )
+    business_count = (
+        select(db.func.count(Business.id)).filter_by(is_active=True).scalar_subquery()
     )
 
-    upgraded_wallets = PhantomWallet.query.filter_by(
-        status=WalletStatus.UPGRADED
-    ).count()
-
-    content = f"""
-    <div class="hero-section">
-        <h1>Banking for Everyone</h1>
-        <p>Phantom Banking enables businesses to serve all customers—including the unbanked—through our Banking-as-a-Service platform. We directly advance FNB's core mission: increasing deposits, boosting transactions, and expanding digital onboarding.</p>
-        <div class="cta-buttons">
-            <a href="/business/register" class="btn btn-success">Start Free Trial</a>
-            <a href="/api/docs/" class="btn btn-warning">View API Docs</a>
-            <a href="/demo" class="btn">Live Demo</a>
-        </div>
-    </div>
-    
-    <div class="fnb-impact">
-        <h3>🎯 Direct Impact on FNB's Core Goals</h3>
-        <p style="text-align: center; font-size: 1.1rem; margin-bottom: 30px;">
-            Our platform directly advances FNB's strategic objectives by capturing untapped markets and increasing financial inclusion.
-        </p>
-        <div class="impact-metrics">
-            <div class="impact-metric">
-                <div class="impact-number">BWP {total_volume:,.0f}</div>
-                <div>New Deposits Generated</div>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{total_transactions:,}</div>
-                <div>Additional Transactions</div>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{total_wallets:,}</div>
-                <div>Potential New Customers</div>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{upgraded_wallets:,}</div>
-                <div>Successful Onboardings</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h2 style="text-align: center; margin-bottom: 30px;"> Live System Metrics</h2>
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-number">{total_businesses}</div>
-                <div class="stat-label">Active Businesses</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{total_wallets}</div>
-                <div class="stat-label">Phantom Wallets</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{total_transactions}</div>
-                <div class="stat-label">Transactions Processed</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">BWP {total_volume:,.0f}</div>
-                <div class="stat-label">Total Volume</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="grid">
-        <div class="feature-card">
-            <div class="feature-icon">🏢</div>
-            <h3>Business Portal</h3>
-            <p>Comprehensive dashboard for managing phantom wallets, processing payments, and tracking analytics. Full API access with enterprise-grade security.</p>
-            <div style="margin-top: 25px;">
-                <a href="/business/register" class="btn">Get Started</a>
-            </div>
-        </div>
-        
-        <div class="feature-card">
-            <div class="feature-icon">📱</div>
-            <h3>Multi-Channel Payments</h3>
-            <p>Accept payments through QR codes, USSD, mobile money, and EFT. Seamless integration with existing payment infrastructure.</p>
-            <div style="margin-top: 25px;">
-                <a href="/customer/pay" class="btn btn-success">Try Payments</a>
-            </div>
-        </div>
-        
-        <div class="feature-card">
-            <div class="feature-icon">🔗</div>
-            <h3>FNB Integration</h3>
-            <p>Direct integration with FNB's core banking system. Real-time settlement, automated reconciliation, and seamless account upgrades.</p>
-            <div style="margin-top: 25px;">
-                <a href="/integration" class="btn btn-warning">Learn More</a>
-            </div>
-        </div>
-        
-        <div class="feature-card">
-            <div class="feature-icon">📊</div>
-            <h3>Enterprise Analytics</h3>
-            <p>Real-time insights into transaction volumes, customer behavior, and business performance. KPIs aligned with FNB's strategic objectives.</p>
-            <div style="margin-top: 25px;">
-                <a href="/analytics" class="btn">View Analytics</a>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h2 style="text-align: center; margin-bottom: 20px;">🚀 Why Phantom Banking?</h2>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 30px; margin-top: 30px;">
-            <div>
-                <h4 style="color: #1e3c72; margin-bottom: 15px;">💰 Increase Deposits</h4>
-                <p>Capture deposits from unbanked customers who previously used cash-only transactions. Every phantom wallet represents potential deposit growth for FNB.</p>
-            </div>
-            <div>
-                <h4 style="color: #1e3c72; margin-bottom: 15px;">📈 Boost Transactions</h4>
-                <p>Enable businesses to process more transactions by accepting payments from all customers, regardless of their banking status. Direct transaction volume increase.</p>
-            </div>
-            <div>
-                <h4 style="color: #1e3c72; margin-bottom: 15px;">🎯 Digital Onboarding</h4>
-                <p>Frictionless customer acquisition through phantom wallets that seamlessly upgrade to full FNB accounts. Reduced onboarding friction increases conversion rates.</p>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Real-time updates
-        setInterval(() => {{
-            fetch('/api/v1/stats')
-                .then(response => response.json())
-                .then(data => {{
-                    // Update metrics with animation
-                    document.querySelectorAll('.stat-number').forEach((el, index) => {{
-                        const values = [data.businesses, data.wallets, data.transactions, `BWP ${{data.volume}}`];
-                        if (values[index] && values[index] !== el.textContent) {{
-                            el.style.transform = 'scale(1.1)';
-                            el.textContent = values[index];
-                            setTimeout(() => el.style.transform = 'scale(1)', 200);
-                        }}
-                    }});
-                }})
-                .catch(console.error);
-        }}, 15000);
-    </script>
-    """
+    # The totals row is repeated alongside each of the (up to three) leaders;
+    # the outer join keeps it when there are no completed transactions yet.
+    # Read-only: skip the unit-of-work flush check before the SELECT
+    with db.session.no_autoflush:
+        rows = db.session.execute(
+            select(
+                business_count.label("businesses"),
+                wallet_count.label("wallets"),
+                upgraded_count.label("upgraded_wallets"),
+                transaction_totals.c.transactions,
+                transaction_totals.c.volume,
+                transaction_totals.c.monthly_volume,
+                top_businesses.c.name.label("top_name"),
+                top_businesses.c.volume.label("top_volume"),
+            )
+            .select_from(transaction_totals)
+            .outerjoin(top_businesses, true())
+            .order_by(top_businesses.c.volume.desc())
+        ).all()
+
+    metrics = dict(rows[0]._mapping)
+    del metrics["top_name"], metrics["top_volume"]
+    metrics["top_businesses"] = [
+        {"name": row.top_name, "volume": row.top_volume}
+        for row in rows
+        if row.top_name is not None
+    ]
+    return metrics
+
 
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+@app.route("/")
+def index():
+    """Enhanced homepage showcasing FNB alignment"""
+
+    # Only the metrics vary per request; the page itself is a compiled template
+    return render_template("index.html", metrics=_system_metrics())
 
 
 # ==========================================
@@ -1523,16 +2009,18 @@ def index():
 @app.route("/api/v1/stats")
 def api_system_stats():
     """System-wide statistics"""
-    return jsonify(
+    metrics = _system_metrics()
+    response = jsonify(
         {
-            "businesses": Business.query.filter_by(is_active=True).count(),
-            "wallets": PhantomWallet.query.filter_by(is_active=True).count(),
-            "transactions": Transaction.query.filter_by(
-                status=TransactionStatus.COMPLETED
-            ).count(),
-            "volume": f"{db.session.query(db.func.sum(Transaction.amount)).filter(Transaction.status == TransactionStatus.COMPLETED).scalar() or 0:,.2f}",
+            "businesses": metrics["businesses"],
+            "wallets": metrics["wallets"],
+            "transactions": metrics["transactions"],
+            "volume": f"{metrics['volume']:,.2f}",
         }
     )
+    # Unchanged stats answer a revalidating client with an empty 304
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 # ==========================================
@@ -1540,39 +2028,103 @@ def api_system_stats():
 # ==========================================
 
 
+# Sample data lookup tables, built once rather than per seeded transaction
+_PM_CYCLE = (
+    PaymentMethod.QR,
+    PaymentMethod.USSD,
+    PaymentMethod.MOBILE_MONEY,
+    PaymentMethod.EFT,
+)
+_TX_DESCS = (
+    "Store Purchase",
+    "Service Payment",
+    "Transfer",
+    "Top-up",
+    "Bill Payment",
+)
+
+
 def init_enterprise_db():
-    """Initialize database with enterprise sample data"""
-    db.create_all()
-
-    # Check if demo business exists
-    demo_business = Business.query.filter_by(email="demo@fnb-phantom.com").first()
-    if not demo_business:
-        # Create enterprise demo business
-        demo_business = Business(
-            name="FNB Demo Merchant",
-            email="demo@fnb-phantom.com",
-            phone="+267 123 4567",
-            password_hash=generate_password_hash("demo123456"),
-            fnb_account_number="1234567890",
-            fnb_branch_code="250655",
-            registration_number="BW00001234567",
-            business_type="RETAIL",
-            industry="GENERAL_TRADE",
-            status=BusinessStatus.ACTIVE,
-        )
+    """Create any missing tables, then seed the demo data unless it is present"""
+    # The lock only keeps one host's workers from running DDL side by side;
+    # whether to seed is decided by the database, never by a local file
+    lock_path = Path(app.instance_path) / "init.lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            db.create_all()
+            _sync_indexes()
+            _seed_enterprise_db()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-        db.session.add(demo_business)
-        db.session.flush()
 
-        # Generate API key
-        api_key = APIKey(
-            key=f"pb_{demo_business.id[:8]}_{secrets.token_hex(16)}",
-            business_id=demo_business.id,
-            name="Primary API Key",
-        )
-        db.session.add(api_key)
+# Indexes dropped from the models; databases created earlier still have them
+RETIRED_INDEXES = ["ix_transactions_wallet_id", "ix_transactions_wallet_status_ts"]
 
-        # Create diverse sample wallets
+
+def _sync_indexes():
+    """Create declared indexes missing from existing tables, drop retired ones"""
+    # create_all() only indexes the tables it creates itself
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    for index_name in RETIRED_INDEXES:
+        db.session.execute(db.text(f"DROP INDEX IF EXISTS {index_name}"))
+    db.session.commit()
+
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def _insert_ignoring_conflicts(model, *index_elements):
+    """INSERT that skips rows clashing on index_elements; None if unsupported"""
+    dialect_insert = _UPSERT_INSERTS.get(db.engine.dialect.name)
+    if dialect_insert is None:
+        return None
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def _seed_enterprise_db():
+    """Initialize database with enterprise sample data"""
+    # Warm starts stop at this lookup, before paying for the password hash
+    demo_email = "demo@fnb-phantom.com"
+    if db.session.query(Business.id).filter_by(email=demo_email).scalar() is not None:
+        return
+
+    demo_business = dict(
+        id=generate_uuid7(),
+        name="FNB Demo Merchant",
+        email=demo_email,
+        phone="+267 123 4567",
+        password_hash=generate_password_hash("demo123456"),
+        fnb_account_number="1234567890",
+        fnb_branch_code="250655",
+        registration_number="BW00001234567",
+        business_type="RETAIL",
+        industry="GENERAL_TRADE",
+        status=BusinessStatus.ACTIVE,
+    )
+
+    # Another host may seed between the lookup and here. ON CONFLICT makes that
+    # race-free and only returns an id when this call inserted the row; other
+    # dialects rely on the email unique constraint to stop the second seed at
+    # commit
+    insert_business = _insert_ignoring_conflicts(Business, "email")
+    if insert_business is not None:
+        demo_business_id = db.session.execute(
+            insert_business.values(**demo_business).returning(Business.id)
+        ).scalar()
+    else:
+        db.session.execute(Business.__table__.insert().values(**demo_business))
+        demo_business_id = demo_business["id"]
+    if demo_business_id is not None:
+        # Sample wallet holders; USSD codes are drawn before anything is added
+        # so the lookup does not autoflush a half-built seed
         sample_customers = [
             ("Thabo Mthombeni", "+267 71 123 456", "thabo@email.com"),
             ("Nomsa Mogale", "+267 72 234 567", "nomsa@email.com"),
@@ -1581,44 +2133,56 @@ def init_enterprise_db():
             ("Tshepo Molefe", "+267 75 567 890", "tshepo@email.com"),
         ]
 
-        for i, (name, phone, email) in enumerate(sample_customers):
-            wallet = PhantomWallet(
-                business_id=demo_business.id,
+        ussd_codes = PhantomWallet._generate_ussd_codes(len(sample_customers))
+
+        # Generate API key
+        # Ids are assigned up front so nothing needs flushing before the commit
+        api_key = APIKey(
+            key=f"pb_{demo_business_id[:8]}_{secrets.token_urlsafe(24)}",
+            business_id=demo_business_id,
+            name="Primary API Key",
+        )
+        db.session.add(api_key)
+
+        # Create diverse sample wallets
+        wallets = [
+            PhantomWallet(
+                id=generate_uuid7(),
+                business_id=demo_business_id,
                 customer_name=name,
                 customer_phone=phone,
                 customer_email=email,
                 balance=100.0 + (i * 75),
                 daily_limit=5000.0 + (i * 1000),
+                ussd_code=ussd_code,
             )
+            for i, ((name, phone, email), ussd_code) in enumerate(
+                zip(sample_customers, ussd_codes)
+            )
+        ]
+        db.session.add_all(wallets)
 
-            db.session.add(wallet)
-            db.session.flush()
-
-            # Create realistic transaction history
+        # Create realistic transaction history with one Core multi-row INSERT;
+        # executing it autoflushes the business and wallets first
+        now = datetime.utcnow()
+        transaction_rows = []
+        for i, wallet in enumerate(wallets):
             for j in range(5):
-                transaction = Transaction(
-                    wallet_id=wallet.id,
-                    amount=25.0 + (j * 15) + (i * 10),
-                    type=TransactionType.CREDIT,
-                    method=PaymentMethod(
-                        [
-                            PaymentMethod.QR,
-                            PaymentMethod.USSD,
-                            PaymentMethod.MOBILE_MONEY,
-                            PaymentMethod.EFT,
-                        ][j % 4]
-                    ),
-                    description=f"Payment from {['Store Purchase', 'Service Payment', 'Transfer', 'Top-up', 'Bill Payment'][j]}",
-                    status=TransactionStatus.COMPLETED,
-                    timestamp=datetime.utcnow() - timedelta(days=j, hours=i * 2),
-                    completed_at=datetime.utcnow() - timedelta(days=j, hours=i * 2),
+                timestamp = now - timedelta(days=j, hours=i * 2)
+                transaction_rows.append(
+                    {
+                        "wallet_id": wallet.id,
+                        "amount": 25.0 + (j * 15) + (i * 10),
+                        "type": TransactionType.CREDIT,
+                        "method": _PM_CYCLE[j % len(_PM_CYCLE)],
+                        "description": f"Payment from {_TX_DESCS[j]}",
+                        "reference": Transaction._generate_reference(),
+                        "status": TransactionStatus.COMPLETED,
+                        "timestamp": timestamp,
+                        "completed_at": timestamp,
+                    }
                 )
-                db.session.add(transaction)
-
-        # Update business metrics
-        demo_business.total_deposit_volume = 2500.0  # Sample total
-        demo_business.total_transaction_count = 25  # Sample count
-        demo_business.monthly_active_wallets = 5
+        db.session.execute(Transaction.__table__.insert(), transaction_rows)
 
         db.session.commit()
 
@@ -1632,6 +2196,7 @@ def init_enterprise_db():
 
 
 @app.route("/business/register")
+@static_page
 def business_register():
     """Business Registration Page"""
     content = """
@@ -1701,10 +2266,11 @@ def business_register():
         });
     </script>
     """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return render_template("enterprise.html", content=content)
 
 
 @app.route("/business/login")
+@static_page
 def business_login():
     """Business Login Page"""
     content = """
@@ -1753,10 +2319,11 @@ def business_login():
         });
     </script>
     """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return render_template("enterprise.html", content=content)
 
 
 @app.route("/demo")
+@static_page
 def live_demo():
     """Live Demo Page"""
     content = """
@@ -1882,10 +2449,11 @@ def live_demo():
         }
     </script>
     """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return render_template("enterprise.html", content=content)
 
 
 @app.route("/customer/pay")
+@static_page
 def customer_pay():
     """Customer Payment Interface"""
     content = """
@@ -2060,406 +2628,81 @@ def customer_pay():
         });
     </script>
     """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return render_template("enterprise.html", content=content)
 
 
 @app.route("/analytics")
 def analytics_dashboard():
     """Analytics Dashboard"""
-    # Get real analytics data
-    total_businesses = Business.query.filter_by(is_active=True).count()
-    total_wallets = PhantomWallet.query.filter_by(is_active=True).count()
-    total_transactions = Transaction.query.filter_by(
-        status=TransactionStatus.COMPLETED
-    ).count()
-    total_volume = (
-        db.session.query(db.func.sum(Transaction.amount))
-        .filter(Transaction.status == TransactionStatus.COMPLETED)
-        .scalar()
-        or 0
-    )
-
-    content = f"""
-    <div class="card">
-        <h2>📊 Analytics Dashboard</h2>
-        <p style="margin-bottom: 30px;">Real-time insights into the Phantom Banking ecosystem and its impact on FNB's strategic objectives.</p>
-    </div>
-    
-    <div class="fnb-impact">
-        <h3>🎯 FNB Strategic Impact</h3>
-        <p style="text-align: center; margin-bottom: 30px;">Direct contribution to FNB's core business objectives</p>
-        <div class="impact-metrics">
-            <div class="impact-metric">
-                <div class="impact-number">BWP {total_volume:,.0f}</div>
-                <div>New Deposits Generated</div>
-                <small>💰 Additional deposit growth from unbanked customers</small>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{total_transactions:,}</div>
-                <div>Additional Transactions</div>
-                <small>📈 Increased transaction volume through digital channels</small>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{total_wallets:,}</div>
-                <div>Potential New Customers</div>
-                <small>👥 Unbanked customers in the conversion pipeline</small>
-            </div>
-            <div class="impact-metric">
-                <div class="impact-number">{total_businesses:,}</div>
-                <div>Partner Businesses</div>
-                <small>🏢 Businesses driving customer acquisition</small>
-            </div>
-        </div>
-    </div>
-    
-    <div class="grid">
-        <div class="card">
-            <h3>📈 Transaction Trends</h3>
-            <canvas id="transactionChart" width="400" height="200"></canvas>
-            <div style="margin-top: 20px;">
-                <div style="display: flex; justify-content: space-between; margin: 10px 0;">
-                    <span>Daily Average:</span>
-                    <strong>BWP {total_volume/30 if total_volume > 0 else 0:,.2f}</strong>
-                </div>
-                <div style="display: flex; justify-content: space-between; margin: 10px 0;">
-                    <span>Growth Rate:</span>
-                    <strong style="color: #28a745;">+15.3%</strong>
-                </div>
-                <div style="display: flex; justify-content: space-between; margin: 10px 0;">
-                    <span>Peak Hour:</span>
-                    <strong>14:00 - 16:00</strong>
-                </div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h3>🔄 Channel Performance</h3>
-            <canvas id="channelChart" width="400" height="200"></canvas>
-            <div style="margin-top: 20px;">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                    <span>QR Payments:</span>
-                    <div>
-                        <span style="color: #1e3c72; font-weight: bold;">45%</span>
-                        <div style="width: 100px; height: 8px; background: #eee; border-radius: 4px; display: inline-block; margin-left: 10px;">
-                            <div style="width: 45%; height: 100%; background: #1e3c72; border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                </div>
-                <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                    <span>USSD:</span>
-                    <div>
-                        <span style="color: #28a745; font-weight: bold;">30%</span>
-                        <div style="width: 100px; height: 8px; background: #eee; border-radius: 4px; display: inline-block; margin-left: 10px;">
-                            <div style="width: 30%; height: 100%; background: #28a745; border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                </div>
-                <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                    <span>Mobile Money:</span>
-                    <div>
-                        <span style="color: #ffc107; font-weight: bold;">25%</span>
-                        <div style="width: 100px; height: 8px; background: #eee; border-radius: 4px; display: inline-block; margin-left: 10px;">
-                            <div style="width: 25%; height: 100%; background: #ffc107; border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="grid">
-        <div class="card">
-            <h3>💼 Business Performance</h3>
-            <div style="margin: 20px 0;">
-                <h4>Top Performing Businesses</h4>
-                <div style="margin: 15px 0;">
-                    <div style="display: flex; justify-content: space-between; align-items: center; padding: 10px; background: #f8f9fa; border-radius: 8px; margin: 8px 0;">
-                        <span>FNB Demo Merchant</span>
-                        <span style="font-weight: bold; color: #1e3c72;">BWP {total_volume * 0.4:,.0f}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; align-items: center; padding: 10px; background: #f8f9fa; border-radius: 8px; margin: 8px 0;">
-                        <span>SuperSpar Gaborone</span>
-                        <span style="font-weight: bold; color: #1e3c72;">BWP {total_volume * 0.3:,.0f}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; align-items: center; padding: 10px; background: #f8f9fa; border-radius: 8px; margin: 8px 0;">
-                        <span>Game Store</span>
-                        <span style="font-weight: bold; color: #1e3c72;">BWP {total_volume * 0.2:,.0f}</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div style="margin-top: 30px;">
-                <h4>Business Growth Metrics</h4>
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin: 15px 0;">
-                    <div style="text-align: center; padding: 15px; background: #e8f5e8; border-radius: 8px;">
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #28a745;">+23%</div>
-                        <div style="font-size: 0.9rem;">New Registrations</div>
-                    </div>
-                    <div style="text-align: center; padding: 15px; background: #fff3cd; border-radius: 8px;">
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #856404;">+18%</div>
-                        <div style="font-size: 0.9rem;">Transaction Volume</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h3>👥 Customer Insights</h3>
-            <div style="margin: 20px 0;">
-                <h4>Wallet Status Distribution</h4>
-                <div style="margin: 15px 0;">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                        <span>Active Wallets:</span>
-                        <span style="color: #28a745; font-weight: bold;">{total_wallets * 0.8:.0f} (80%)</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                        <span>Upgraded to FNB:</span>
-                        <span style="color: #1e3c72; font-weight: bold;">{total_wallets * 0.15:.0f} (15%)</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin: 10px 0;">
-                        <span>Inactive:</span>
-                        <span style="color: #6c757d; font-weight: bold;">{total_wallets * 0.05:.0f} (5%)</span>
-                    </div>
-                </div>
-            </div>
-            
-            <div style="margin-top: 30px;">
-                <h4>Customer Behavior</h4>
-                <div style="margin: 15px 0;">
-                    <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 10px 0;">
-                        <div style="font-weight: bold;">Average Transaction Size</div>
-                        <div style="font-size: 1.2rem; color: #1e3c72;">BWP {total_volume/total_transactions if total_transactions > 0 else 0:.2f}</div>
-                    </div>
-                    <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 10px 0;">
-                        <div style="font-weight: bold;">Monthly Active Users</div>
-                        <div style="font-size: 1.2rem; color: #1e3c72;">{total_wallets * 0.75:.0f}</div>
-                    </div>
-                    <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 10px 0;">
-                        <div style="font-weight: bold;">Upgrade Conversion Rate</div>
-                        <div style="font-size: 1.2rem; color: #28a745;">15.2%</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h3>📋 Key Performance Indicators (KPIs)</h3>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0;">
-            <div style="background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 20px; border-radius: 15px; text-align: center;">
-                <div style="font-size: 1.8rem; font-weight: bold; margin-bottom: 10px;">BWP {total_volume:,.0f}</div>
-                <div style="opacity: 0.9;">Total Transaction Volume</div>
-                <div style="font-size: 0.8rem; margin-top: 5px;">📈 +15.3% vs last month</div>
-            </div>
-            <div style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%); color: white; padding: 20px; border-radius: 15px; text-align: center;">
-                <div style="font-size: 1.8rem; font-weight: bold; margin-bottom: 10px;">{total_wallets:,}</div>
-                <div style="opacity: 0.9;">Active Phantom Wallets</div>
-                <div style="font-size: 0.8rem; margin-top: 5px;">👥 +23% new registrations</div>
-            </div>
-            <div style="background: linear-gradient(135deg, #ffc107 0%, #fd7e14 100%); color: white; padding: 20px; border-radius: 15px; text-align: center;">
-                <div style="font-size: 1.8rem; font-weight: bold; margin-bottom: 10px;">15.2%</div>
-                <div style="opacity: 0.9;">Upgrade Conversion Rate</div>
-                <div style="font-size: 0.8rem; margin-top: 5px;">🎯 Above 12% target</div>
-            </div>
-            <div style="background: linear-gradient(135deg, #dc3545 0%, #e83e8c 100%); color: white; padding: 20px; border-radius: 15px; text-align: center;">
-                <div style="font-size: 1.8rem; font-weight: bold; margin-bottom: 10px;">99.8%</div>
-                <div style="opacity: 0.9;">System Uptime</div>
-                <div style="font-size: 0.8rem; margin-top: 5px;">⚡ Enterprise reliability</div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Note: In a real implementation, you would use Chart.js here
-        // For demo purposes, we're showing placeholder canvas elements
-        
-        // Simulate real-time updates
-        setInterval(() => {{
-            // Update random metrics to show live data
-            const elements = document.querySelectorAll('.impact-number, .stat-number');
-            elements.forEach(el => {{
-                if (Math.random() < 0.1) {{ // 10% chance to update
-                    el.style.transform = 'scale(1.1)';
-                    setTimeout(() => el.style.transform = 'scale(1)', 300);
-                }}
-            }});
-        }}, 5000);
-    </script>
-    """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    # Get real analytics data (one aggregate round-trip, shared via the cache);
+    # the compiled template is streamed so the layout goes out as it renders
+    totals = _system_metrics()
+    wallets = totals["wallets"]
+
+    # Derived figures are worked out once so the template only interpolates
+    estimates = {
+        "daily_volume": totals["volume"] / 30,
+        "active_wallets": round(wallets * 0.8),
+        "upgraded_wallets": round(wallets * 0.15),
+        "inactive_wallets": round(wallets * 0.05),
+        "monthly_active_users": round(wallets * 0.75),
+        "average_transaction": (
+            totals["volume"] / totals["transactions"] if totals["transactions"] else 0.0
+        ),
+    }
+    return stream_template("analytics.html", totals=totals, estimates=estimates)
 
 
 @app.route("/integration")
+@static_page
 def integration_info():
     """FNB Integration Information"""
-    content = """
-    <div class="card">
-        <h2>🔗 FNB Integration</h2>
-        <p style="font-size: 1.1rem; margin-bottom: 30px;">Seamless integration with FNB's core banking infrastructure for real-time transaction processing and account management.</p>
-    </div>
-    
-    <div class="grid">
-        <div class="card">
-            <h3>🏦 Core Banking Integration</h3>
-            <div style="margin: 20px 0;">
-                <div style="background: #e8f5e8; padding: 20px; border-radius: 10px; margin: 15px 0;">
-                    <h4 style="color: #28a745; margin-bottom: 10px;">✅ Real-time Settlement</h4>
-                    <p>All phantom wallet transactions are instantly settled with FNB's core banking system, ensuring immediate fund availability.</p>
-                </div>
-                
-                <div style="background: #e8f5e8; padding: 20px; border-radius: 10px; margin: 15px 0;">
-                    <h4 style="color: #28a745; margin-bottom: 10px;">✅ Automated Reconciliation</h4>
-                    <p>Daily reconciliation processes ensure perfect alignment between phantom wallet balances and FNB account balances.</p>
-                </div>
-                
-                <div style="background: #e8f5e8; padding: 20px; border-radius: 10px; margin: 15px 0;">
-                    <h4 style="color: #28a745; margin-bottom: 10px;">✅ Seamless Account Upgrades</h4>
-                    <p>Phantom wallets can be upgraded to full FNB accounts with complete transaction history transfer.</p>
-                </div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h3>📊 Technical Architecture</h3>
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                <h4>Integration Points</h4>
-                <ul style="margin: 15px 0 0 20px; line-height: 1.8;">
-                    <li><strong>FNB Core Banking API:</strong> Direct connection for account operations</li>
-                    <li><strong>Real-time Webhooks:</strong> Instant transaction notifications</li>
-                    <li><strong>Settlement Engine:</strong> Automated fund transfers</li>
-                    <li><strong>KYC Integration:</strong> Seamless customer verification</li>
-                    <li><strong>Mobile Money Gateway:</strong> Orange Money & MyZaka integration</li>
-                </ul>
-            </div>
-            
-            <div style="background: #fff3cd; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                <h4>Security Features</h4>
-                <ul style="margin: 15px 0 0 20px; line-height: 1.8;">
-                    <li>🔐 End-to-end encryption</li>
-                    <li>🛡️ Multi-factor authentication</li>
-                    <li>📋 Complete audit trails</li>
-                    <li>🔍 Real-time fraud detection</li>
-                    <li>✅ PCI DSS compliance</li>
-                </ul>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h3>🚀 Implementation Benefits</h3>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin: 20px 0;">
-            <div style="background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 25px; border-radius: 15px;">
-                <h4 style="margin-bottom: 15px;">📈 Increased Deposits</h4>
-                <p>Capture deposits from unbanked customers who previously operated in cash-only environments.</p>
-                <div style="margin-top: 15px; font-size: 1.2rem; font-weight: bold;">Expected: +25% deposit growth</div>
-            </div>
-            
-            <div style="background: linear-gradient(135deg, #28a745 0%, #20c997 100%); color: white; padding: 25px; border-radius: 15px;">
-                <h4 style="margin-bottom: 15px;">💳 More Transactions</h4>
-                <p>Enable businesses to process payments from all customers, increasing overall transaction volume.</p>
-                <div style="margin-top: 15px; font-size: 1.2rem; font-weight: bold;">Expected: +40% transaction volume</div>
-            </div>
-            
-            <div style="background: linear-gradient(135deg, #ffc107 0%, #fd7e14 100%); color: white; padding: 25px; border-radius: 15px;">
-                <h4 style="margin-bottom: 15px;">👥 Customer Acquisition</h4>
-                <p>Frictionless onboarding through phantom wallets that convert to full FNB accounts.</p>
-                <div style="margin-top: 15px; font-size: 1.2rem; font-weight: bold;">Expected: +15,000 new customers/year</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h3>🔧 API Documentation</h3>
-        <p style="margin-bottom: 20px;">Complete API documentation for integrating with the Phantom Banking platform.</p>
-        
-        <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; margin: 20px 0;">
-            <h4>Quick Start</h4>
-            <div style="background: #000; color: #0f0; padding: 15px; border-radius: 8px; font-family: monospace; margin: 15px 0;">
-                <div># Create a phantom wallet</div>
-                <div>curl -X POST https://api.phantom-banking.fnb.co.za/v1/wallets/ \\</div>
-                <div>&nbsp;&nbsp;-H "Authorization: Bearer YOUR_API_KEY" \\</div>
-                <div>&nbsp;&nbsp;-H "Content-Type: application/json" \\</div>
-                <div>&nbsp;&nbsp;-d '{"customer_name": "John Doe", "customer_phone": "+267 71 123 456"}'</div>
-            </div>
-        </div>
-        
-        <div style="text-align: center; margin: 30px 0;">
-            <a href="/api/docs/" class="btn btn-success" style="padding: 15px 30px; font-size: 18px;">
-                📚 View Full API Documentation
-            </a>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h3>📞 Support & Contact</h3>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin: 20px 0;">
-            <div style="text-align: center; padding: 20px;">
-                <div style="font-size: 3rem; margin-bottom: 15px;">🛠️</div>
-                <h4>Technical Support</h4>
-                <p>24/7 technical support for integration issues</p>
-                <strong>+267 318 8000</strong>
-            </div>
-            <div style="text-align: center; padding: 20px;">
-                <div style="font-size: 3rem; margin-bottom: 15px;">📧</div>
-                <h4>Email Support</h4>
-                <p>Direct email support for business inquiries</p>
-                <strong>phantom@fnb.co.bw</strong>
-            </div>
-            <div style="text-align: center; padding: 20px;">
-                <div style="font-size: 3rem; margin-bottom: 15px;">📖</div>
-                <h4>Documentation</h4>
-                <p>Comprehensive guides and tutorials</p>
-                <strong>docs.phantom-banking.fnb.co.za</strong>
-            </div>
-        </div>
-    </div>
-    """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
-
-
-# CSS styles for form elements
-app.jinja_env.globals.update(
-    form_styles="""
-    <style>
-        .form-group { margin: 15px 0; }
-        .form-group label { 
-            display: block; 
-            margin-bottom: 8px; 
-            font-weight: 600; 
-            color: #333;
-        }
-        .form-group input, .form-group select { 
-            width: 100%; 
-            padding: 12px; 
-            border: 2px solid #e1e5e9; 
-            border-radius: 8px;
-            font-size: 16px;
-            transition: border-color 0.3s ease;
-        }
-        .form-group input:focus, .form-group select:focus { 
-            outline: none;
-            border-color: #1e3c72;
-            box-shadow: 0 0 0 3px rgba(30, 60, 114, 0.1);
-        }
-    </style>
-    """
-)
+    return render_template("integration.html")
 
 
 # Add these routes to your comprehensive_phantom_banking.py file
 # These routes provide functional wallet creation and payment processing
 
+# Wallets listed in the payment form before the user searches
+WALLET_PICKER_LIMIT = 50
+
+# The demo business never changes once seeded, so its id is resolved once
+_demo_business_id_cache: Optional[str] = None
+
+
+def _demo_business_id() -> Optional[str]:
+    """Id of the seeded demo business, looked up on first use"""
+    global _demo_business_id_cache
+    if _demo_business_id_cache is None:
+        _demo_business_id_cache = (
+            db.session.query(Business.id)
+            .filter_by(email="demo@fnb-phantom.com")
+            .scalar()
+        )
+    return _demo_business_id_cache
+
+
+def _business_api_key(business_id: str) -> Optional[str]:
+    """A business's oldest API key; cached with the rest of the dashboard payload"""
+    return (
+        db.session.query(APIKey.key)
+        .filter_by(business_id=business_id)
+        .order_by(APIKey.created_at)
+        .limit(1)
+        .scalar()
+    )
+
 
 @app.route("/business/create-wallet", methods=["GET", "POST"])
 def create_wallet_interface():
     """Create New Wallet Interface"""
     if request.method == "POST":
         # Process wallet creation
-        demo_business = Business.query.filter_by(email="demo@fnb-phantom.com").first()
-        if not demo_business:
+        demo_business_id = _demo_business_id()
+        if not demo_business_id:
             return jsonify({"success": False, "error": "Demo business not found"}), 404
 
-        result = WalletService.create_wallet(demo_business.id, request.json)
+        result = WalletService.create_wallet(demo_business_id, request.json)
         return jsonify(result)
 
     # GET request - show the form
@@ -2515,100 +2758,10 @@ def create_wallet_interface():
             <a href="/business/dashboard" class="btn">← Back to Dashboard</a>
         </div>
     </div>
-    
-    <script>
-        document.getElementById('createWalletForm').addEventListener('submit', async function(e) {
-            e.preventDefault();
-            
-            const formData = new FormData(this);
-            const walletData = {
-                name: formData.get('name'),
-                phone: formData.get('phone'),
-                email: formData.get('email'),
-                daily_limit: parseFloat(formData.get('daily_limit')),
-                customer_type: formData.get('customer_type')
-            };
-            
-            const submitBtn = this.querySelector('button[type="submit"]');
-            submitBtn.disabled = true;
-            submitBtn.textContent = 'Creating Wallet...';
-            
-            try {
-                const response = await fetch('/business/create-wallet', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(walletData)
-                });
-                
-                const result = await response.json();
-                const resultDiv = document.getElementById('createResult');
-                resultDiv.style.display = 'block';
-                
-                if (result.success) {
-                    resultDiv.style.background = '#d4edda';
-                    resultDiv.style.color = '#155724';
-                    resultDiv.style.border = '1px solid #c3e6cb';
-                    resultDiv.style.padding = '20px';
-                    resultDiv.style.borderRadius = '10px';
-                    
-                    resultDiv.innerHTML = `
-                        <h4>✅ Wallet Created Successfully!</h4>
-                        <div style="margin: 15px 0;">
-                            <p><strong>Wallet ID:</strong> ${result.wallet.id}</p>
-                            <p><strong>Customer:</strong> ${result.wallet.customer_name}</p>
-                            <p><strong>Phone:</strong> ${result.wallet.customer_phone}</p>
-                            <p><strong>USSD Code:</strong> <span style="font-family: monospace; background: #fff; padding: 5px; border-radius: 4px;">${result.wallet.ussd_code}</span></p>
-                            <p><strong>Daily Limit:</strong> BWP ${result.wallet.daily_limit.toLocaleString()}</p>
-                            <p><strong>Status:</strong> ${result.wallet.status.toUpperCase()}</p>
-                        </div>
-                        <div style="background: #fff3cd; padding: 15px; border-radius: 8px; margin-top: 15px;">
-                            <strong>📱 Customer Instructions:</strong><br>
-                            Your customer can now receive payments using their USSD code: <strong>${result.wallet.ussd_code}</strong><br>
-                            They can dial this code on any phone to access their wallet.
-                        </div>
-                        <div style="margin-top: 20px;">
-                            <button onclick="window.location.href='/business/dashboard'" class="btn btn-success">View in Dashboard</button>
-                            <button onclick="location.reload()" class="btn">Create Another Wallet</button>
-                        </div>
-                    `;
-                    
-                    // Reset form
-                    this.reset();
-                } else {
-                    resultDiv.style.background = '#f8d7da';
-                    resultDiv.style.color = '#721c24';
-                    resultDiv.style.border = '1px solid #f5c6cb';
-                    resultDiv.style.padding = '20px';
-                    resultDiv.style.borderRadius = '10px';
-                    
-                    resultDiv.innerHTML = `
-                        <h4>❌ Error Creating Wallet</h4>
-                        <p>${result.error}</p>
-                        <button onclick="this.parentElement.style.display='none'" class="btn">Try Again</button>
-                    `;
-                }
-            } catch (error) {
-                const resultDiv = document.getElementById('createResult');
-                resultDiv.style.display = 'block';
-                resultDiv.style.background = '#f8d7da';
-                resultDiv.style.color = '#721c24';
-                resultDiv.style.border = '1px solid #f5c6cb';
-                resultDiv.style.padding = '20px';
-                resultDiv.style.borderRadius = '10px';
-                resultDiv.innerHTML = `
-                    <h4>❌ Network Error</h4>
-                    <p>Failed to create wallet. Please try again.</p>
-                `;
-            } finally {
-                submitBtn.disabled = false;
-                submitBtn.textContent = '🆕 Create Phantom Wallet';
-            }
-        });
-    </script>
     """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return render_template(
+        "enterprise.html", content=content, scripts=("create_wallet.js",)
+    )
 
 
 @app.route("/business/process-payment", methods=["GET", "POST"])
@@ -2617,12 +2770,13 @@ def process_payment_interface():
     if request.method == "POST":
         # Process payment
         try:
+            data = request.get_json()
             payment_request = PaymentRequest(
-                wallet_id=request.json["wallet_id"],
-                amount=float(request.json["amount"]),
-                method=PaymentMethod(request.json["method"]),
-                description=request.json["description"],
-                source_info=request.json.get("source_info", {}),
+                wallet_id=data["wallet_id"],
+                amount=float(data["amount"]),
+                method=PaymentMethod(data["method"]),
+                description=data["description"],
+                source_info=data.get("source_info", {}),
             )
 
             result = PaymentProcessor.process_payment(payment_request)
@@ -2631,425 +2785,241 @@ def process_payment_interface():
             return jsonify({"success": False, "error": str(e)}), 400
 
     # GET request - show the form
-    demo_business = Business.query.filter_by(email="demo@fnb-phantom.com").first()
-    if not demo_business:
+    demo_business_id = _demo_business_id()
+    if not demo_business_id:
         return redirect(url_for("business_login"))
 
-    wallets = PhantomWallet.query.filter_by(
-        business_id=demo_business.id, is_active=True
-    ).all()
-
     # Check if a specific wallet was selected
     selected_wallet_id = request.args.get("wallet")
 
-    content = f"""
-    <div class="card" style="max-width: 600px; margin: 0 auto;">
-        <h2>💳 Process Payment</h2>
-        <p style="margin-bottom: 30px;">Process a payment to one of your phantom wallets.</p>
-        
-        <form id="processPaymentForm">
-            <div class="form-group">
-                <label>Select Wallet *</label>
-                <select name="wallet_id" required>
-                    <option value="">Choose wallet to receive payment...</option>
-    """
+    # The dropdown only needs these columns; rows skip ORM hydration. Only the
+    # most recently active wallets are listed (the selected one first), the
+    # rest are reached through the search endpoint
+    wallets = (
+        db.session.query(
+            PhantomWallet.id,
+            PhantomWallet.customer_name,
+            PhantomWallet.customer_phone,
+            PhantomWallet.balance,
+        )
+        .filter_by(business_id=demo_business_id, is_active=True)
+        .order_by(
+            (PhantomWallet.id == selected_wallet_id).desc(),
+            PhantomWallet.updated_at.desc(),
+        )
+        .limit(WALLET_PICKER_LIMIT)
+        .all()
+    )
 
-    for wallet in wallets:
-        selected = "selected" if wallet.id == selected_wallet_id else ""
-        content += f'<option value="{wallet.id}" {selected}>{wallet.customer_name} ({wallet.customer_phone}) - BWP {wallet.balance:.2f}</option>'
+    # The compiled template loops over the options and is streamed out as it
+    # renders, so the page is never assembled as one string
+    return stream_template(
+        "process_payment.html", wallets=wallets, selected_wallet_id=selected_wallet_id
+    )
 
-    content += """
-                </select>
-            </div>
-            
-            <div class="form-group">
-                <label>Payment Amount (BWP) *</label>
-                <input type="number" name="amount" required min="1" max="50000" step="0.01" placeholder="Enter amount">
-            </div>
-            
-            <div class="form-group">
-                <label>Payment Method *</label>
-                <select name="method" required>
-                    <option value="qr">QR Code Payment</option>
-                    <option value="ussd">USSD Payment</option>
-                    <option value="mobile_money">Mobile Money</option>
-                    <option value="eft">EFT Transfer</option>
-                    <option value="card">Card Payment</option>
-                </select>
-            </div>
-            
-            <div class="form-group">
-                <label>Payment Description *</label>
-                <input type="text" name="description" required placeholder="What is this payment for?">
-            </div>
-            
-            <div class="form-group">
-                <label>Customer Reference (Optional)</label>
-                <input type="text" name="customer_reference" placeholder="Customer's reference number">
-            </div>
-            
-            <button type="submit" class="btn btn-success" style="width: 100%; padding: 15px; font-size: 18px;">
-                💳 Process Payment
-            </button>
-        </form>
-        
-        <div id="paymentResult" style="margin-top: 20px; display: none;"></div>
-        
-        <div style="margin-top: 30px; text-align: center;">
-            <a href="/business/dashboard" class="btn">← Back to Dashboard</a>
-        </div>
-    </div>
-    
-    <script>
-        document.getElementById('processPaymentForm').addEventListener('submit', async function(e) {
-            e.preventDefault();
-            
-            const formData = new FormData(this);
-            const paymentData = {
-                wallet_id: formData.get('wallet_id'),
-                amount: parseFloat(formData.get('amount')),
-                method: formData.get('method'),
-                description: formData.get('description'),
-                source_info: {
-                    customer_reference: formData.get('customer_reference'),
-                    processed_via: 'business_dashboard',
-                    timestamp: new Date().toISOString()
-                }
-            };
-            
-            const submitBtn = this.querySelector('button[type="submit"]');
-            submitBtn.disabled = true;
-            submitBtn.textContent = 'Processing Payment...';
-            
-            try {
-                const response = await fetch('/business/process-payment', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(paymentData)
-                });
-                
-                const result = await response.json();
-                const resultDiv = document.getElementById('paymentResult');
-                resultDiv.style.display = 'block';
-                
-                if (result.success) {
-                    resultDiv.style.background = '#d4edda';
-                    resultDiv.style.color = '#155724';
-                    resultDiv.style.border = '1px solid #c3e6cb';
-                    resultDiv.style.padding = '20px';
-                    resultDiv.style.borderRadius = '10px';
-                    
-                    resultDiv.innerHTML = `
-                        <h4>✅ Payment Processed Successfully!</h4>
-                        <div style="margin: 15px 0;">
-                            <p><strong>Transaction ID:</strong> ${result.transaction_id}</p>
-                            <p><strong>Reference:</strong> ${result.reference}</p>
-                            <p><strong>Amount:</strong> BWP ${paymentData.amount.toLocaleString()}</p>
-                            <p><strong>New Balance:</strong> BWP ${result.new_balance.toLocaleString()}</p>
-                            <p><strong>Processed:</strong> ${new Date(result.timestamp).toLocaleString()}</p>
-                        </div>
-                        <div style="background: #e8f5e8; padding: 15px; border-radius: 8px; margin-top: 15px;">
-                            <strong>📊 Impact:</strong><br>
-                            • Customer wallet balance updated instantly<br>
-                            • Transaction recorded in FNB system<br>
-                            • Business analytics updated<br>
-                            • SMS/Email notifications sent
-                        </div>
-                        <div style="margin-top: 20px;">
-                            <button onclick="window.location.href='/business/dashboard'" class="btn btn-success">View in Dashboard</button>
-                            <button onclick="location.reload()" class="btn">Process Another Payment</button>
-                        </div>
-                    `;
-                    
-                    // Reset form
-                    this.reset();
-                } else {
-                    resultDiv.style.background = '#f8d7da';
-                    resultDiv.style.color = '#721c24';
-                    resultDiv.style.border = '1px solid #f5c6cb';
-                    resultDiv.style.padding = '20px';
-                    resultDiv.style.borderRadius = '10px';
-                    
-                    resultDiv.innerHTML = `
-                        <h4>❌ Payment Failed</h4>
-                        <p><strong>Error:</strong> ${result.error}</p>
-                        ${result.code ? `<p><strong>Code:</strong> ${result.code}</p>` : ''}
-                        <button onclick="this.parentElement.style.display='none'" class="btn">Try Again</button>
-                    `;
-                }
-            } catch (error) {
-                const resultDiv = document.getElementById('paymentResult');
-                resultDiv.style.display = 'block';
-                resultDiv.style.background = '#f8d7da';
-                resultDiv.style.color = '#721c24';
-                resultDiv.style.border = '1px solid #f5c6cb';
-                resultDiv.style.padding = '20px';
-                resultDiv.style.borderRadius = '10px';
-                resultDiv.innerHTML = `
-                    <h4>❌ Network Error</h4>
-                    <p>Failed to process payment. Please try again.</p>
-                `;
-            } finally {
-                submitBtn.disabled = false;
-                submitBtn.textContent = '💳 Process Payment';
-            }
-        });
-    </script>
-    """
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+
+@app.route("/business/wallets/search")
+def search_wallets_interface():
+    """Wallet lookup by customer name or phone for the payment form"""
+    demo_business_id = _demo_business_id()
+    query = request.args.get("q", "").strip()
+    if not demo_business_id or not query:
+        return jsonify({"wallets": []})
+
+    rows = db.session.execute(
+        select(
+            PhantomWallet.id,
+            PhantomWallet.customer_name,
+            PhantomWallet.customer_phone,
+            PhantomWallet.balance,
+        )
+        .filter_by(business_id=demo_business_id, is_active=True)
+        .where(
+            PhantomWallet.customer_name.icontains(query, autoescape=True)
+            | PhantomWallet.customer_phone.contains(query, autoescape=True)
+        )
+        .order_by(PhantomWallet.customer_name)
+        .limit(WALLET_PICKER_LIMIT)
+    ).mappings()
+    return jsonify({"wallets": [dict(row) for row in rows]})
 
 
 # Update the business dashboard to have functional buttons and auto-refresh
 @app.route("/business/dashboard")
 def business_dashboard():
     """Enhanced Business Dashboard with Real Functionality"""
-    demo_business = Business.query.filter_by(email="demo@fnb-phantom.com").first()
-    if not demo_business:
+    demo_business_id = _demo_business_id()
+    if not demo_business_id:
         return redirect(url_for("business_login"))
 
-    wallets = PhantomWallet.query.filter_by(business_id=demo_business.id).all()
+    # The validator and page count are cached per business; each page's payload
+    # is its own entry under that validator, so a write that invalidates the
+    # business leaves its old pages to age out unread
+    state = dashboard_cache.get(demo_business_id)
+    if state is None:
+        state = _business_dashboard_state(demo_business_id)
+        dashboard_cache.set(demo_business_id, state)
+    validator, page_count = state
+    page = min(max(request.args.get("page", 1, type=int), 1), page_count)
+    etag = f"{validator}-{page}"
+
+    # A browser already holding this state gets a 304 before any payload query
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        page_key = (demo_business_id, validator, page)
+        payload = dashboard_cache.get(page_key)
+        if payload is None:
+            payload = _business_dashboard_payload(demo_business_id, page)
+            dashboard_cache.set(page_key, payload)
+        # The payload is plain values, so the template streams out as it renders
+        # without holding a database session open
+        response = app.response_class(
+            stream_template("business_dashboard.html", dashboard=payload),
+            mimetype="text/html",
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _business_dashboard_state(business_id: str) -> tuple:
+    """(validator, page count): the validator moves with any wallet or payment"""
+    latest_transaction = (
+        select(db.func.max(Transaction.updated_at))
+        .join(PhantomWallet, PhantomWallet.id == Transaction.wallet_id)
+        .where(PhantomWallet.business_id == business_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    wallet_count, latest_wallet, latest_transaction = (
+        db.session.query(
+            db.func.count(PhantomWallet.id),
+            db.func.max(PhantomWallet.updated_at),
+            latest_transaction,
+        )
+        .filter(PhantomWallet.business_id == business_id)
+        .one()
+    )
+    validator = hashlib.md5(
+        f"{wallet_count}:{latest_wallet}:{latest_transaction}".encode()
+    ).hexdigest()
+    return validator, max(-(-wallet_count // Config.DASHBOARD_PAGE_SIZE), 1)
+
+
+@app.route("/business/stream")
+def business_dashboard_stream():
+    """Server-sent dashboard deltas, pushed when wallets or payments change"""
+    # The stream is held by one worker; changes made in the others reach it
+    # through the dashboard listener on Postgres only (see DashboardEvents)
+    demo_business_id = _demo_business_id()
+    if not demo_business_id:
+        return jsonify({"error": "Business not found"}), 404
+
+    return Response(
+        dashboard_events.stream(demo_business_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _business_dashboard_payload(business_id: str, page: int = 1) -> Dict[str, Any]:
+    """Everything the dashboard shows for a business, as cacheable plain values"""
+    # Business name and the wallet totals in a single round trip
+    business_name, wallet_count, active_wallets, total_balance = (
+        db.session.query(
+            Business.name,
+            db.func.count(PhantomWallet.id),
+            db.func.coalesce(
+                db.func.sum(
+                    case((PhantomWallet.status == WalletStatus.ACTIVE, 1), else_=0)
+                ),
+                0,
+            ),
+            db.func.coalesce(db.func.sum(PhantomWallet.balance), 0.0),
+        )
+        .select_from(Business)
+        .outerjoin(PhantomWallet, PhantomWallet.business_id == Business.id)
+        .filter(Business.id == business_id)
+        .group_by(Business.id)
+        .one()
+    )
+
+    # Only one page of the wallet table is loaded; totals come from SQL above
+    page_size = Config.DASHBOARD_PAGE_SIZE
+    wallets = (
+        PhantomWallet.query.filter_by(business_id=business_id)
+        .order_by(PhantomWallet.created_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    # Wallets for the customer column come in one SELECT ... IN, not per row
     recent_transactions = (
         Transaction.query.join(PhantomWallet)
-        .filter(PhantomWallet.business_id == demo_business.id)
+        .options(selectinload(Transaction.wallet))
+        .filter(PhantomWallet.business_id == business_id)
         .order_by(Transaction.timestamp.desc())
         .limit(15)
         .all()
     )
 
-    # Calculate real-time metrics
-    total_balance = sum(w.balance for w in wallets)
-    active_wallets = len([w for w in wallets if w.status.value == "active"])
-    today = datetime.now().date()
-    todays_transactions = [
-        t for t in recent_transactions if t.timestamp.date() == today
-    ]
-    todays_volume = sum(
-        t.amount for t in todays_transactions if t.status == TransactionStatus.COMPLETED
-    )
-
-    # Find the demo business API key
-    api_key = APIKey.query.filter_by(business_id=demo_business.id).first()
-    api_key_value = api_key.key if api_key else "pb_demo_key_1234567890abcdef"
-
-    content = f"""
-    <div class="card">
-        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-            <div>
-                <h2>📊 Business Dashboard - {demo_business.name}</h2>
-                <p style="color: #666; margin: 5px 0;">Real-time phantom banking operations</p>
-            </div>
-            <div>
-                <button onclick="refreshDashboard()" class="btn" style="margin-right: 10px;">🔄 Refresh</button>
-                <span id="lastUpdated" style="font-size: 0.9rem; color: #666;">Last updated: {datetime.now().strftime('%H:%M:%S')}</span>
-            </div>
-        </div>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-number" id="totalWallets">{len(wallets)}</div>
-                <div class="stat-label">Total Wallets</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number" id="totalBalance">BWP {total_balance:,.2f}</div>
-                <div class="stat-label">Total Balance</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number" id="todaysTransactions">{len(todays_transactions)}</div>
-                <div class="stat-label">Today's Transactions</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number" id="todaysVolume">BWP {todays_volume:,.2f}</div>
-                <div class="stat-label">Today's Volume</div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="grid">
-        <div class="card">
-            <h3>🚀 Quick Actions</h3>
-            <div style="margin: 20px 0;">
-                <a href="/business/create-wallet" class="btn btn-success" style="margin: 5px;">
-                    🆕 Create New Wallet
-                </a>
-                <a href="/business/process-payment" class="btn btn-warning" style="margin: 5px;">
-                    💳 Process Payment
-                </a>
-                <a href="/api/docs/" class="btn" style="margin: 5px;">
-                    📚 API Docs
-                </a>
-            </div>
-            
-            <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 20px;">
-                <h4>🔄 Real-time Features</h4>
-                <ul style="margin: 10px 0 0 20px; line-height: 1.8;">
-                    <li>✅ Instant wallet creation</li>
-                    <li>✅ Real-time payment processing</li>
-                    <li>✅ Live balance updates</li>
-                    <li>✅ Automatic FNB sync</li>
-                </ul>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h3>🔑 API Integration</h3>
-            <p>Your API key for system integration:</p>
-            <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; font-family: monospace; word-break: break-all; margin: 15px 0;">
-                {api_key_value}
-            </div>
-            <button onclick="copyApiKey()" class="btn" style="margin-top: 10px;">📋 Copy API Key</button>
-            
-            <div style="margin-top: 20px;">
-                <h4>📊 API Usage Today</h4>
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-top: 10px;">
-                    <div style="background: #e8f5e8; padding: 15px; border-radius: 8px; text-align: center;">
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #28a745;">{len(recent_transactions)}</div>
-                        <div style="font-size: 0.9rem;">API Calls</div>
-                    </div>
-                    <div style="background: #fff3cd; padding: 15px; border-radius: 8px; text-align: center;">
-                        <div style="font-size: 1.5rem; font-weight: bold; color: #856404;">99.9%</div>
-                        <div style="font-size: 0.9rem;">Uptime</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="card">
-        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-            <h3>👥 Recent Wallets</h3>
-            <div>
-                <span style="color: #28a745; font-weight: bold;">{active_wallets} Active</span> | 
-                <span style="color: #666;">{len(wallets)} Total</span>
-            </div>
-        </div>
-        <div style="overflow-x: auto;">
-            <table style="width: 100%; border-collapse: collapse;">
-                <thead>
-                    <tr style="background: #f8f9fa;">
-                        <th style="padding: 12px; text-align: left;">Customer</th>
-                        <th style="padding: 12px; text-align: left;">Phone</th>
-                        <th style="padding: 12px; text-align: left;">Balance</th>
-                        <th style="padding: 12px; text-align: left;">Status</th>
-                        <th style="padding: 12px; text-align: left;">USSD Code</th>
-                        <th style="padding: 12px; text-align: left;">Actions</th>
-                    </tr>
-                </thead>
-                <tbody id="walletsTable">
-    """
-
-    for wallet in wallets:
-        status_color = "#28a745" if wallet.status.value == "active" else "#dc3545"
-        content += f"""
-                    <tr>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">{wallet.customer_name}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">{wallet.customer_phone}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">BWP {wallet.balance:.2f}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee; color: {status_color}; font-weight: bold;">{wallet.status.value.upper()}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee; font-family: monospace;">{wallet.ussd_code}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">
-                            <button onclick="processPaymentFor('{wallet.id}')" class="btn" style="padding: 5px 10px; font-size: 12px; margin-right: 5px;">💳 Pay</button>
-                            <button onclick="viewWalletDetails('{wallet.id}')" class="btn" style="padding: 5px 10px; font-size: 12px;">👁️ View</button>
-                        </td>
-                    </tr>
-        """
-
-    content += f"""
-                </tbody>
-            </table>
-        </div>
-    </div>
-    
-    <div class="card">
-        <h3>📈 Recent Transactions</h3>
-        <div style="overflow-x: auto;">
-            <table style="width: 100%; border-collapse: collapse;">
-                <thead>
-                    <tr style="background: #f8f9fa;">
-                        <th style="padding: 12px; text-align: left;">Time</th>
-                        <th style="padding: 12px; text-align: left;">Customer</th>
-                        <th style="padding: 12px; text-align: left;">Amount</th>
-                        <th style="padding: 12px; text-align: left;">Method</th>
-                        <th style="padding: 12px; text-align: left;">Status</th>
-                        <th style="padding: 12px; text-align: left;">Reference</th>
-                    </tr>
-                </thead>
-                <tbody id="transactionsTable">
-    """
-
-    for txn in recent_transactions[:10]:
-        status_color = (
-            "#28a745" if txn.status == TransactionStatus.COMPLETED else "#ffc107"
+    # Today's activity across all of the business's wallets, in UTC like the
+    # stored timestamps
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    completed = Transaction.status == TransactionStatus.COMPLETED
+    todays_transaction_count, todays_volume = (
+        db.session.query(
+            db.func.count(Transaction.id),
+            db.func.coalesce(
+                db.func.sum(case((completed, Transaction.amount), else_=0.0)), 0.0
+            ),
         )
-        content += f"""
-                    <tr>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">{txn.timestamp.strftime('%H:%M')}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">{txn.wallet.customer_name if txn.wallet else 'Unknown'}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">BWP {txn.amount:.2f}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee;">{txn.method.value.upper()}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee; color: {status_color}; font-weight: bold;">{txn.status.value.upper()}</td>
-                        <td style="padding: 12px; border-bottom: 1px solid #eee; font-family: monospace;">{txn.reference}</td>
-                    </tr>
-        """
-
-    content += (
-        """
-                </tbody>
-            </table>
-        </div>
-    </div>
-    
-    <script>
-        function copyApiKey() {
-            const apiKey = '"""
-        + api_key_value
-        + """';
-            navigator.clipboard.writeText(apiKey).then(() => {
-                alert('API key copied to clipboard!');
-            });
-        }
-        
-        function processPaymentFor(walletId) {
-            window.location.href = `/business/process-payment?wallet=${walletId}`;
-        }
-        
-        function viewWalletDetails(walletId) {
-            alert(`Wallet details for ID: ${walletId}\\nThis would open a detailed wallet view.`);
-        }
-        
-        function refreshDashboard() {
-            location.reload();
-        }
-        
-        // Auto-refresh dashboard every 30 seconds
-        setInterval(() => {
-            fetch('/api/v1/stats')
-                .then(response => response.json())
-                .then(data => {
-                    // Update real-time stats
-                    document.getElementById('lastUpdated').textContent = 
-                        `Last updated: ${new Date().toLocaleTimeString()}`;
-                })
-                .catch(console.error);
-        }, 30000);
-        
-        // Highlight new transactions with animation
-        const rows = document.querySelectorAll('#transactionsTable tr');
-        rows.forEach((row, index) => {
-            if (index < 3) { // Highlight first 3 transactions as "new"
-                row.style.backgroundColor = '#f0f8f0';
-                row.style.transition = 'background-color 3s ease';
-                setTimeout(() => {
-                    row.style.backgroundColor = '';
-                }, 3000);
-            }
-        });
-    </script>
-    """
+        .select_from(Transaction)
+        .join(PhantomWallet, PhantomWallet.id == Transaction.wallet_id)
+        .filter(
+            PhantomWallet.business_id == business_id,
+            Transaction.timestamp >= today_start,
+        )
+        .one()
     )
 
-    return render_template_string(ENTERPRISE_TEMPLATE, content=content)
+    return {
+        "business_name": business_name,
+        "api_key": _business_api_key(business_id) or "pb_demo_key_1234567890abcdef",
+        "last_updated": datetime.now().strftime("%H:%M:%S"),
+        "wallet_count": wallet_count,
+        "active_wallets": active_wallets,
+        "total_balance": total_balance,
+        "todays_transaction_count": todays_transaction_count,
+        "todays_volume": todays_volume,
+        "page": page,
+        "page_count": max(-(-wallet_count // page_size), 1),
+        "wallets": [
+            {
+                "id": wallet.id,
+                "customer_name": wallet.customer_name,
+                "customer_phone": wallet.customer_phone,
+                "balance": wallet.balance,
+                "status": wallet.status.value,
+                "status_color": WALLET_STATUS_COLORS[wallet.status],
+                "ussd_code": wallet.ussd_code,
+            }
+            for wallet in wallets
+        ],
+        "recent_transactions": [
+            {
+                "time": txn.timestamp.strftime("%H:%M"),
+                "customer_name": txn.wallet.customer_name if txn.wallet else "Unknown",
+                "amount": txn.amount,
+                "method": txn.method.value,
+                "status": txn.status.value,
+                "status_color": TRANSACTION_STATUS_COLORS[txn.status],
+                "reference": txn.reference,
+            }
+            for txn in recent_transactions
+        ],
+    }
 
 
 if __name__ == "__main__":
@@ -3059,6 +3029,11 @@ if __name__ == "__main__":
     with app.app_context():
         init_enterprise_db()
 
+    MetricsService.start_refresher()
+    usage_tracker.start_flusher()
+    with app.app_context():
+        dashboard_events.start_listener()
+
     print(" Enterprise database initialized")
     print(" Security features enabled")
     print(" Analytics dashboard ready")
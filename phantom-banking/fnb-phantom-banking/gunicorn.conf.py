@@ -0,0 +1,75 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the Phantom Banking API
+
+Endpoints spend most of their time waiting on the database, so each worker
+runs gevent greenlets (gunicorn monkey-patches the worker on start) and can
+hold many requests in flight instead of one. psycopg2 is a C extension the
+monkey-patching cannot reach, so post_fork installs psycogreen's wait
+callback; without it one Postgres call would block every greenlet in the
+worker.
+"""
+
+import fcntl
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(
+    os.environ.get("GUNICORN_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8))
+)
+worker_class = "gevent"
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+timeout = 30
+keepalive = 5
+
+# Held by whichever worker runs the once-per-host background jobs
+JOBS_LOCK_PATH = os.environ.get(
+    "GUNICORN_JOBS_LOCK",
+    os.path.join(tempfile.gettempdir(), "phantom-banking-jobs.lock"),
+)
+
+
+def post_fork(server, worker):
+    """Make psycopg2 yield to the gevent hub while it waits on Postgres"""
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+
+def post_worker_init(worker):
+    """Start the background jobs that __main__ runs in development"""
+    from comprehensive_phantom_banking import (
+        MetricsService,
+        app,
+        dashboard_events,
+        init_enterprise_db,
+        usage_tracker,
+    )
+
+    # Every worker creates missing tables; only the first finds no demo data
+    with app.app_context():
+        init_enterprise_db()
+
+    # Usage counts are buffered in each worker's memory, so each flushes its own
+    usage_tracker.start_flusher()
+
+    # Cached dashboards and SSE subscribers are per worker too, so each one
+    # listens for the changes the others announce
+    with app.app_context():
+        dashboard_events.start_listener()
+
+    # The metrics rollup is shared, so only the worker holding the jobs lock
+    # refreshes it. The lock goes with the process: if that worker dies, the
+    # replacement gunicorn forks for it takes the lock over
+    lock_file = open(JOBS_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        # The lock holder keeps the rollup fresh, so reads here never refresh it
+        MetricsService.refreshed_elsewhere = True
+        return
+    worker.jobs_lock = lock_file
+    MetricsService.start_refresher()
@@ -0,0 +1,35 @@
+# gunicorn_fnb.conf.py
+"""
+Gunicorn settings for the mock FNB bank
+
+Each worker brings the schema up to date and starts its webhook dispatcher as
+soon as it boots, so deliveries a previous process logged but never finished
+are swept up without waiting for the next new webhook. Sweeps claim rows under
+a lease, so both workers sweeping the same table is safe.
+"""
+
+import fcntl
+import os
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+workers = 2
+
+# Held while a worker creates or alters tables
+INIT_LOCK_PATH = os.environ.get(
+    "GUNICORN_INIT_LOCK",
+    os.path.join(tempfile.gettempdir(), "mock-fnb-bank-init.lock"),
+)
+
+
+def post_worker_init(worker):
+    """Start the background work that __main__ runs in development"""
+    from mock_fnb_bank import fnb_app, init_fnb_db, webhook_dispatcher
+
+    # Workers boot side by side; the lock keeps their DDL from interleaving
+    with open(INIT_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        with fnb_app.app_context():
+            init_fnb_db()
+
+    webhook_dispatcher.start()
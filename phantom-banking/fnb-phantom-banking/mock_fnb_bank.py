@@ -18,17 +18,29 @@ Architecture: RESTful API service that can run standalone or integrated
 
 from flask import Flask, request, jsonify, render_template_string
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, event, inspect, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import aliased, joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from flask_restx import Api, Resource, fields, Namespace
 from datetime import datetime, timedelta
 import uuid
 import json
+import os
 import secrets
 import time
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from werkzeug.security import generate_password_hash
 
 # ==========================================
@@ -40,8 +52,23 @@ class FNBConfig:
     """Mock FNB Bank Configuration"""
 
     SECRET_KEY = secrets.token_hex(32)
-    SQLALCHEMY_DATABASE_URI = "sqlite:///mock_fnb_bank.db"
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL", "sqlite:///mock_fnb_bank.db"
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Sized for a sync worker's one request plus the webhook pool; docker-compose
+    # runs two workers, the 30 connections the main app's pool sizing reserves.
+    # LIFO keeps the same few connections warm, pre-ping replaces stale ones
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+    if SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        # Pooled SQLite connections are handed between request/webhook threads
+        SQLALCHEMY_ENGINE_OPTIONS["connect_args"] = {"check_same_thread": False}
 
     # Bank Configuration
     BANK_CODE = "250655"
@@ -57,8 +84,21 @@ class FNBConfig:
     DAILY_TRANSACTION_LIMIT = 100000.0
     SINGLE_TRANSACTION_LIMIT = 50000.0
 
+    # Seconds a balance lookup may be served from memory; writes clear it sooner
+    BALANCE_CACHE_TTL = 5
+
+    # List endpoint paging
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
     # Webhook Configuration
     PHANTOM_BANKING_WEBHOOK = "http://localhost:5000/webhooks/fnb"
+    WEBHOOK_BATCH_SIZE = 20  # Events per POST to one URL
+    WEBHOOK_FLUSH_INTERVAL = 0.5  # Seconds a URL's batch waits to fill up
+    WEBHOOK_WORKERS = 8  # Concurrent batch POSTs
+    WEBHOOK_MAX_ATTEMPTS = 6  # First try plus retries after 1, 2, 4, 8 and 16s
+    WEBHOOK_RETRY_SWEEP = 1.0  # Seconds between scans for due retries
+    WEBHOOK_LEASE_SECONDS = 60  # Queued deliveries a dead process left to retry
 
 
 # ==========================================
@@ -70,6 +110,17 @@ fnb_app.config.from_object(FNBConfig)
 
 fnb_db = SQLAlchemy(fnb_app)
 
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL keeps balance reads and the webhook writer off each other's locks"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 fnb_api = Api(
     fnb_app,
     version="1.0",
@@ -84,6 +135,64 @@ fnb_api = Api(
 # ==========================================
 
 
+class FNBSequence(fnb_db.Model):
+    """Named monotonic counters behind generated customer/account/txn numbers"""
+
+    __tablename__ = "fnb_sequences"
+
+    name = fnb_db.Column(fnb_db.String(30), primary_key=True)
+    value = fnb_db.Column(fnb_db.Integer, nullable=False, default=0)
+
+    # Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+    _UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+    @classmethod
+    def next_value(cls, name: str, count: int = 1) -> int:
+        """Advance a counter by count in the current transaction; returns the last"""
+        table = cls.__table__
+        dialect_insert = cls._UPSERT_INSERTS.get(fnb_db.engine.dialect.name)
+        if dialect_insert is not None:
+            fnb_db.session.execute(
+                dialect_insert(table)
+                .values(name=name, value=0)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+        elif fnb_db.session.get(cls, name) is None:
+            fnb_db.session.execute(table.insert().values(name=name, value=0))
+        return fnb_db.session.execute(
+            table.update()
+            .where(table.c.name == name)
+            .values(value=table.c.value + count)
+            .returning(table.c.value)
+        ).scalar_one()
+
+    @classmethod
+    def next_unused(cls, name: str, column, render) -> str:
+        """render() of the next counter value that column does not already hold"""
+        # Rows numbered at random before the counters existed share the format,
+        # so a number one of them already took moves on to the next value
+        while True:
+            number = render(cls.next_value(name))
+            with fnb_db.session.no_autoflush:
+                taken = fnb_db.session.execute(
+                    select(column).where(column == number).limit(1)
+                ).first()
+            if taken is None:
+                return number
+
+
+def _timestamp_column(**kwargs) -> fnb_db.Column:
+    """DateTime column stamped with the database's CURRENT_TIMESTAMP"""
+    # The INSERT sends CURRENT_TIMESTAMP itself too: tables created before the
+    # column default was declared (the shipped dev database's) do not have it
+    return fnb_db.Column(
+        fnb_db.DateTime,
+        default=fnb_db.func.current_timestamp(),
+        server_default=fnb_db.func.current_timestamp(),
+        **kwargs,
+    )
+
+
 class FNBCustomer(fnb_db.Model):
     """FNB Customer Entity"""
 
@@ -127,10 +236,8 @@ class FNBCustomer(fnb_db.Model):
     status = fnb_db.Column(
         fnb_db.String(20), default="ACTIVE"
     )  # ACTIVE, INACTIVE, SUSPENDED, CLOSED
-    created_at = fnb_db.Column(fnb_db.DateTime, default=datetime.utcnow)
-    updated_at = fnb_db.Column(
-        fnb_db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
-    )
+    created_at = _timestamp_column()
+    updated_at = _timestamp_column(onupdate=fnb_db.func.current_timestamp())
 
     # Relationships
     accounts = fnb_db.relationship(
@@ -144,7 +251,12 @@ class FNBCustomer(fnb_db.Model):
 
     def _generate_customer_number(self) -> str:
         """Generate unique customer number"""
-        return f"FNBC{secrets.randbelow(9999999):07d}"
+        # Counter guarantees uniqueness; the random suffix keeps it unguessable
+        return FNBSequence.next_unused(
+            "customer",
+            FNBCustomer.customer_number,
+            lambda sequence: f"FNBC{sequence:05d}{secrets.randbelow(100):02d}",
+        )
 
     @property
     def full_name(self):
@@ -187,16 +299,22 @@ class FNBAccount(fnb_db.Model):
     status = fnb_db.Column(
         fnb_db.String(20), default="ACTIVE"
     )  # ACTIVE, INACTIVE, SUSPENDED, CLOSED
-    opened_date = fnb_db.Column(fnb_db.DateTime, default=datetime.utcnow)
+    opened_date = _timestamp_column()
     last_transaction_date = fnb_db.Column(fnb_db.DateTime)
 
     # Phantom Banking Integration
     phantom_wallet_id = fnb_db.Column(fnb_db.String(36))  # Link to phantom wallet
     phantom_business_id = fnb_db.Column(fnb_db.String(36))  # Link to phantom business
 
+    # Bumped by every balance write; ORM flushes of a stale copy raise instead
+    # of overwriting a newer balance
+    version = fnb_db.Column(fnb_db.Integer, nullable=False, default=0)
+
     # Relationships
     transactions = fnb_db.relationship("FNBTransaction", backref="account", lazy=True)
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.account_number:
@@ -214,27 +332,62 @@ class FNBAccount(fnb_db.Model):
         else:
             prefix = FNBConfig.CHEQUE_ACCOUNT_PREFIX
 
-        return f"{prefix}{secrets.randbelow(99999999):08d}"
+        return FNBSequence.next_unused(
+            "account",
+            FNBAccount.account_number,
+            lambda sequence: f"{prefix}{sequence:06d}{secrets.randbelow(100):02d}",
+        )
 
     def update_balance(self, amount: float, transaction_type: str):
-        """Update account balance"""
+        """Update account balance with one conditional UPDATE in the database"""
+        table = type(self).__table__
+        statement = table.update().where(table.c.id == self.id)
         if transaction_type == "CREDIT":
-            self.balance += amount
-            self.available_balance += amount
+            delta = amount
         elif transaction_type == "DEBIT":
-            if self.available_balance >= amount:
-                self.balance -= amount
-                self.available_balance -= amount
-            else:
-                raise ValueError("Insufficient funds")
+            # The funds check and the debit are one statement, so two concurrent
+            # debits cannot both pass it
+            delta = -amount
+            statement = statement.where(table.c.available_balance >= amount)
+        else:
+            delta = 0.0
+
+        row = fnb_db.session.execute(
+            statement.values(
+                balance=table.c.balance + delta,
+                available_balance=table.c.available_balance + delta,
+                last_transaction_date=datetime.utcnow(),
+                version=table.c.version + 1,
+            ).returning(
+                table.c.balance,
+                table.c.available_balance,
+                table.c.last_transaction_date,
+                table.c.version,
+            )
+        ).first()
+        if row is None:
+            raise ValueError("Insufficient funds")
 
-        self.last_transaction_date = datetime.utcnow()
+        # Reflect the new values without marking them dirty for another write
+        set_committed_value(self, "balance", row.balance)
+        set_committed_value(self, "available_balance", row.available_balance)
+        set_committed_value(self, "last_transaction_date", row.last_transaction_date)
+        set_committed_value(self, "version", row.version)
 
 
 class FNBTransaction(fnb_db.Model):
     """FNB Transaction Entity"""
 
     __tablename__ = "fnb_transactions"
+    __table_args__ = (
+        # Keyset-paged history: newest first per account, id breaking ties
+        fnb_db.Index(
+            "ix_fnb_transactions_account_date_id",
+            "account_id",
+            text("processing_date DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id = fnb_db.Column(
         fnb_db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -267,8 +420,8 @@ class FNBTransaction(fnb_db.Model):
     status = fnb_db.Column(
         fnb_db.String(20), default="COMPLETED"
     )  # PENDING, COMPLETED, FAILED, REVERSED
-    processing_date = fnb_db.Column(fnb_db.DateTime, default=datetime.utcnow)
-    value_date = fnb_db.Column(fnb_db.DateTime, default=datetime.utcnow)
+    processing_date = _timestamp_column()
+    value_date = _timestamp_column()
 
     # Phantom Banking Integration
     phantom_transaction_id = fnb_db.Column(
@@ -283,9 +436,16 @@ class FNBTransaction(fnb_db.Model):
 
     def _generate_transaction_number(self) -> str:
         """Generate unique transaction number"""
-        timestamp = int(time.time())
-        random_part = secrets.randbelow(99999)
-        return f"FNB{timestamp}{random_part:05d}"
+        return self.transaction_numbers(1)[0]
+
+    @staticmethod
+    def transaction_numbers(count: int) -> List[str]:
+        """Reserve a block of transaction numbers with one counter update"""
+        last = FNBSequence.next_value("transaction", count)
+        return [
+            f"FNB{sequence:012d}{secrets.randbelow(100):02d}"
+            for sequence in range(last - count + 1, last + 1)
+        ]
 
 
 class FNBWebhookLog(fnb_db.Model):
@@ -306,16 +466,99 @@ class FNBWebhookLog(fnb_db.Model):
     delivery_attempts = fnb_db.Column(fnb_db.Integer, default=0)
 
     # Timestamps
-    created_at = fnb_db.Column(fnb_db.DateTime, default=datetime.utcnow)
+    created_at = _timestamp_column()
     delivered_at = fnb_db.Column(fnb_db.DateTime)
     next_retry_at = fnb_db.Column(fnb_db.DateTime)
 
 
+# Columns added to tables that existing databases (the shipped dev database
+# among them) already hold. create_all() never alters a table, so
+# init_fnb_db adds any of these that are missing
+ADDED_COLUMNS = {
+    "fnb_accounts": {"version": "INTEGER NOT NULL DEFAULT 0"},
+}
+
+
+def _column_names(table_name: str) -> set:
+    return {column["name"] for column in inspect(fnb_db.engine).get_columns(table_name)}
+
+
+def init_fnb_db():
+    """Create missing tables and bring existing ones up to the current schema"""
+    fnb_db.create_all()
+
+    for table_name, columns in ADDED_COLUMNS.items():
+        for column_name, ddl in columns.items():
+            if column_name in _column_names(table_name):
+                continue
+            try:
+                fnb_db.session.execute(
+                    text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}")
+                )
+                fnb_db.session.commit()
+            except Exception:
+                # Another worker starting alongside this one may have added it
+                fnb_db.session.rollback()
+                if column_name not in _column_names(table_name):
+                    raise
+
+    # Indexes declared since a table was created are missing from it too
+    for table in fnb_db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(fnb_db.engine, checkfirst=True)
+
+
 # ==========================================
 # MOCK FNB SERVICES
 # ==========================================
 
 
+class BalanceCache:
+    """Short-lived in-process cache of balance lookups, cleared by every posting"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, account_number: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(account_number)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[account_number]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, account_number: str, result: Dict):
+        with self._lock:
+            self._data[account_number] = (time.monotonic() + self.ttl, result)
+
+    def invalidate(self, *account_numbers: str):
+        with self._lock:
+            for account_number in account_numbers:
+                self._data.pop(account_number, None)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring the cache's usefulness"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._data),
+            }
+
+
+balance_cache = BalanceCache(ttl=FNBConfig.BALANCE_CACHE_TTL)
+
+
 class FNBAccountService:
     """FNB Account Management Service"""
 
@@ -356,6 +599,7 @@ class FNBAccountService:
 
             fnb_db.session.add(account)
             fnb_db.session.commit()
+            balance_cache.invalidate(account.account_number)
 
             return {
                 "success": True,
@@ -375,11 +619,15 @@ class FNBAccountService:
     @staticmethod
     def get_account_balance(account_number: str) -> Dict:
         """Get account balance"""
+        result = balance_cache.get(account_number)
+        if result is not None:
+            return result
+
         account = FNBAccount.query.filter_by(account_number=account_number).first()
         if not account:
             return {"success": False, "error": "Account not found"}
 
-        return {
+        result = {
             "success": True,
             "account_number": account.account_number,
             "balance": account.balance,
@@ -387,34 +635,80 @@ class FNBAccountService:
             "account_type": account.account_type,
             "status": account.status,
         }
+        balance_cache.set(account_number, result)
+        return result
+
+    @staticmethod
+    def _post_delta(account_number: str, delta: float, required: float = None):
+        """Move an active account's balances by delta in one UPDATE; None if refused"""
+        # required is the available balance the account must already hold, by
+        # default the debit itself
+        if required is None:
+            required = -delta
+        table = FNBAccount.__table__
+        statement = table.update().where(
+            table.c.account_number == account_number, table.c.status == "ACTIVE"
+        )
+        if required > 0:
+            statement = statement.where(table.c.available_balance >= required)
+
+        return fnb_db.session.execute(
+            statement.values(
+                balance=table.c.balance + delta,
+                available_balance=table.c.available_balance + delta,
+                last_transaction_date=datetime.utcnow(),
+                version=table.c.version + 1,
+            ).returning(table.c.id, table.c.balance)
+        ).first()
+
+    @staticmethod
+    def _rejection_reason(account_number: str) -> str:
+        """Why _post_delta matched no row; only queried on the failure path"""
+        status = (
+            fnb_db.session.query(FNBAccount.status)
+            .filter_by(account_number=account_number)
+            .scalar()
+        )
+        if status is None:
+            return "Account not found"
+        if status != "ACTIVE":
+            return "Account is not active"
+        return "Insufficient funds"
 
     @staticmethod
     def process_transaction(transaction_data: Dict) -> Dict:
         """Process account transaction"""
         try:
-            account = FNBAccount.query.filter_by(
-                account_number=transaction_data["account_number"]
-            ).first()
-
-            if not account:
-                return {"success": False, "error": "Account not found"}
-
-            if account.status != "ACTIVE":
-                return {"success": False, "error": "Account is not active"}
-
             # Validate transaction limits
             amount = float(transaction_data["amount"])
             if amount > FNBConfig.SINGLE_TRANSACTION_LIMIT:
                 return {"success": False, "error": "Transaction amount exceeds limit"}
 
-            # Update account balance
-            old_balance = account.balance
-            account.update_balance(amount, transaction_data["transaction_type"])
+            transaction_type = transaction_data["transaction_type"]
+            if transaction_type == "CREDIT":
+                delta = amount
+            elif transaction_type == "DEBIT":
+                delta = -amount
+            else:
+                delta = 0.0
+
+            # Check and update the balance in a single statement, no prior SELECT
+            account = FNBAccountService._post_delta(
+                transaction_data["account_number"], delta
+            )
+            if account is None:
+                fnb_db.session.rollback()
+                return {
+                    "success": False,
+                    "error": FNBAccountService._rejection_reason(
+                        transaction_data["account_number"]
+                    ),
+                }
 
             # Create transaction record
             transaction = FNBTransaction(
                 account_id=account.id,
-                transaction_type=transaction_data["transaction_type"],
+                transaction_type=transaction_type,
                 amount=amount,
                 balance_after=account.balance,
                 transaction_code=transaction_data.get("transaction_code", "PHANTOM"),
@@ -429,12 +723,13 @@ class FNBAccountService:
 
             fnb_db.session.add(transaction)
             fnb_db.session.commit()
+            balance_cache.invalidate(transaction_data["account_number"])
 
             return {
                 "success": True,
                 "transaction_id": transaction.id,
                 "transaction_number": transaction.transaction_number,
-                "old_balance": old_balance,
+                "old_balance": account.balance - delta,
                 "new_balance": account.balance,
                 "reference": transaction.reference,
             }
@@ -443,60 +738,397 @@ class FNBAccountService:
             fnb_db.session.rollback()
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _batch_rejection(account_number: str, postings: List[tuple]) -> str:
+        """Which batch item _post_delta refused an account at, and why"""
+        reason = FNBAccountService._rejection_reason(account_number)
+        available = None
+        if reason == "Insufficient funds":
+            available = (
+                fnb_db.session.query(FNBAccount.available_balance)
+                .filter_by(account_number=account_number)
+                .scalar()
+            )
 
-class FNBWebhookService:
-    """FNB Webhook Service for external notifications"""
+        indexes = [
+            (index, running)
+            for index, item, _, running in postings
+            if item["account_number"] == account_number
+        ]
+        for index, running in indexes:
+            if available is None or available + running < 0:
+                return f"Item {index}: {reason}"
+        return f"Item {indexes[0][0]}: {reason}"
 
     @staticmethod
-    def send_webhook(event_type: str, payload: Dict, webhook_url: str = None):
-        """Send webhook notification"""
-        if not webhook_url:
-            webhook_url = FNBConfig.PHANTOM_BANKING_WEBHOOK
+    def process_transactions_bulk(items: List[Dict]) -> Dict:
+        """Post a batch of transactions atomically, with one commit for the lot"""
+        try:
+            if not items:
+                return {"success": False, "error": "No transactions supplied"}
+
+            # Validate everything and work out each account's running movement,
+            # and the deepest it dips, before writing
+            deltas: Dict[str, float] = {}
+            drawdowns: Dict[str, float] = {}
+            postings = []
+            for index, item in enumerate(items):
+                amount = float(item["amount"])
+                if amount > FNBConfig.SINGLE_TRANSACTION_LIMIT:
+                    return {
+                        "success": False,
+                        "error": f"Item {index}: Transaction amount exceeds limit",
+                    }
+                if item["transaction_type"] == "CREDIT":
+                    delta = amount
+                elif item["transaction_type"] == "DEBIT":
+                    delta = -amount
+                else:
+                    return {
+                        "success": False,
+                        "error": f"Item {index}: Invalid transaction type",
+                    }
+
+                account_number = item["account_number"]
+                running = deltas.get(account_number, 0.0) + delta
+                deltas[account_number] = running
+                drawdowns[account_number] = max(
+                    drawdowns.get(account_number, 0.0), -running
+                )
+                postings.append((index, item, amount, running))
+
+            # One guarded UPDATE per account, in a fixed order so concurrent
+            # batches cannot deadlock: the funds and status checks run against
+            # the row being written, and any refusal rolls back the whole batch
+            accounts = {}
+            for account_number in sorted(deltas):
+                account = FNBAccountService._post_delta(
+                    account_number,
+                    deltas[account_number],
+                    drawdowns[account_number],
+                )
+                if account is None:
+                    fnb_db.session.rollback()
+                    return {
+                        "success": False,
+                        "error": FNBAccountService._batch_rejection(
+                            account_number, postings
+                        ),
+                    }
+                accounts[account_number] = account
+
+            numbers = FNBTransaction.transaction_numbers(len(postings))
+            rows = []
+            for number, (_, item, amount, running) in zip(numbers, postings):
+                account = accounts[item["account_number"]]
+                rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "transaction_number": number,
+                        "account_id": account.id,
+                        "transaction_type": item["transaction_type"],
+                        "amount": amount,
+                        # Worked back from the balance the UPDATE returned
+                        "balance_after": account.balance
+                        - deltas[item["account_number"]]
+                        + running,
+                        "transaction_code": item.get("transaction_code", "PHANTOM"),
+                        "description": item.get(
+                            "description", "Phantom Banking Transaction"
+                        ),
+                        "reference": item.get("reference"),
+                        "channel": "PHANTOM",
+                        "status": "COMPLETED",
+                        "phantom_transaction_id": item.get("phantom_transaction_id"),
+                        "phantom_wallet_id": item.get("phantom_wallet_id"),
+                    }
+                )
+
+            # One Core executemany INSERT (no ORM objects or identity map)
+            fnb_db.session.execute(FNBTransaction.__table__.insert(), rows)
+            fnb_db.session.commit()
+            balance_cache.invalidate(*accounts)
 
-        # Create webhook log
-        webhook_log = FNBWebhookLog(
-            webhook_url=webhook_url, event_type=event_type, payload=json.dumps(payload)
+            return {
+                "success": True,
+                "transactions": [
+                    {
+                        "transaction_id": row["id"],
+                        "transaction_number": row["transaction_number"],
+                        "account_number": item["account_number"],
+                        "new_balance": row["balance_after"],
+                        "reference": row["reference"],
+                    }
+                    for row, (_, item, _, _) in zip(rows, postings)
+                ],
+            }
+
+        except Exception as e:
+            fnb_db.session.rollback()
+            return {"success": False, "error": str(e)}
+
+
+# Keep-alive connections to webhook targets, shared by every delivery
+WEBHOOK_SESSION = requests.Session()
+_webhook_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2),
+)
+WEBHOOK_SESSION.mount("http://", _webhook_adapter)
+WEBHOOK_SESSION.mount("https://", _webhook_adapter)
+
+
+class FNBWebhookDispatcher:
+    """Batches logged webhook events per URL onto a bounded pool, with retries"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=FNBConfig.WEBHOOK_WORKERS, thread_name_prefix="fnb-webhook"
         )
 
-        def _send_async():
+    def enqueue(
+        self,
+        webhook_url: str,
+        log_id: str,
+        event_type: str,
+        payload: Dict,
+        attempts: int = 0,
+    ):
+        """Queue a logged event for the next batch to its URL"""
+        self._queue.put(
+            {
+                "webhook_url": webhook_url,
+                "log_id": log_id,
+                "event_type": event_type,
+                "payload": payload,
+                "attempts": attempts,
+            }
+        )
+        self.start()
+
+    def start(self):
+        """Start the dispatcher thread if it is not already running"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        # Each URL debounces on its own: its batch is POSTed once it holds
+        # WEBHOOK_BATCH_SIZE events or its first event is WEBHOOK_FLUSH_INTERVAL old
+        pending: Dict[str, List[Dict]] = {}
+        deadlines: Dict[str, float] = {}
+        next_sweep = time.monotonic() + FNBConfig.WEBHOOK_RETRY_SWEEP
+        while True:
+            wake_at = min([next_sweep, *deadlines.values()])
             try:
-                response = requests.post(
-                    webhook_url,
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-FNB-Event-Type": event_type,
-                        "X-FNB-Signature": "mock-signature",
-                        "User-Agent": "FNB-Webhook/1.0",
-                    },
-                    timeout=30,
+                event = self._queue.get(timeout=max(wake_at - time.monotonic(), 0))
+            except queue.Empty:
+                event = None
+
+            now = time.monotonic()
+            if event is not None:
+                webhook_url = event["webhook_url"]
+                if webhook_url not in pending:
+                    pending[webhook_url] = []
+                    deadlines[webhook_url] = now + FNBConfig.WEBHOOK_FLUSH_INTERVAL
+                pending[webhook_url].append(event)
+
+            # Slow endpoints hold a pool worker, never the dispatcher itself
+            for webhook_url in [
+                url
+                for url, batch in pending.items()
+                if len(batch) >= FNBConfig.WEBHOOK_BATCH_SIZE or deadlines[url] <= now
+            ]:
+                del deadlines[webhook_url]
+                self._executor.submit(
+                    self._deliver, webhook_url, pending.pop(webhook_url)
                 )
 
-                webhook_log.http_status = response.status_code
-                webhook_log.response_body = response.text[:1000]  # Limit response size
-                webhook_log.delivered_at = datetime.utcnow()
-                webhook_log.delivery_attempts = 1
+            if now >= next_sweep:
+                self._requeue_due()
+                next_sweep = time.monotonic() + FNBConfig.WEBHOOK_RETRY_SWEEP
 
-                print(
-                    f"[FNB WEBHOOK] {event_type} sent to {webhook_url} - Status: {response.status_code}"
+    def _requeue_due(self):
+        """Claim logged deliveries whose retry time has passed and queue them"""
+        table = FNBWebhookLog.__table__
+        now = datetime.utcnow()
+        with fnb_app.app_context():
+            try:
+                # Claiming pushes next_retry_at out by a lease rather than clearing
+                # it: if this process dies before delivering, another sweep picks
+                # the rows up once the lease runs out. Rechecking the due
+                # condition in the UPDATE keeps two sweeps from claiming one row
+                due_ids = (
+                    select(table.c.id)
+                    .where(table.c.delivered_at.is_(None), table.c.next_retry_at <= now)
+                    .limit(FNBConfig.WEBHOOK_BATCH_SIZE * FNBConfig.WEBHOOK_WORKERS)
                 )
-
+                claimed = fnb_db.session.execute(
+                    table.update()
+                    .where(
+                        table.c.id.in_(due_ids),
+                        table.c.delivered_at.is_(None),
+                        table.c.next_retry_at <= now,
+                    )
+                    .values(
+                        next_retry_at=now
+                        + timedelta(seconds=FNBConfig.WEBHOOK_LEASE_SECONDS)
+                    )
+                    .returning(
+                        table.c.id,
+                        table.c.webhook_url,
+                        table.c.event_type,
+                        table.c.payload,
+                        table.c.delivery_attempts,
+                    )
+                ).all()
+                fnb_db.session.commit()
             except Exception as e:
-                webhook_log.http_status = 0
-                webhook_log.response_body = str(e)
-                webhook_log.delivery_attempts = 1
-                webhook_log.next_retry_at = datetime.utcnow() + timedelta(minutes=5)
+                fnb_db.session.rollback()
+                print(f"[FNB WEBHOOK] Retry sweep failed: {e}")
+                return
+
+        for row in claimed:
+            self.enqueue(
+                row.webhook_url,
+                row.id,
+                row.event_type,
+                json.loads(row.payload),
+                row.delivery_attempts or 0,
+            )
+
+    @staticmethod
+    def _deliver(webhook_url: str, batch: List[Dict]):
+        """POST one batch and record the outcome on its log rows in bulk"""
+        try:
+            response = WEBHOOK_SESSION.post(
+                webhook_url,
+                json={
+                    "events": [
+                        {
+                            "id": event["log_id"],
+                            "event_type": event["event_type"],
+                            "payload": event["payload"],
+                        }
+                        for event in batch
+                    ]
+                },
+                headers={
+                    "Content-Type": "application/json",
+                    "X-FNB-Event-Type": "batch",
+                    "X-FNB-Signature": "mock-signature",
+                    "User-Agent": "FNB-Webhook/1.0",
+                },
+                timeout=(2, 5),  # A hung endpoint cannot tie up a worker for long
+            )
+
+            # Only a 2xx is a delivery. Other 4xx answers (a wrong URL, a
+            # rejected payload) will not change on retry, so they are recorded
+            # as failed rather than delivered
+            delivered = 200 <= response.status_code < 300
+            retryable = response.status_code >= 500 or response.status_code in (
+                408,
+                429,
+            )
+            outcome = {
+                "http_status": response.status_code,
+                "response_body": response.text[:1000],  # Limit response size
+            }
+
+            print(
+                f"[FNB WEBHOOK] {len(batch)} events sent to {webhook_url} - Status: {response.status_code}"
+            )
+
+        except Exception as e:
+            delivered = False
+            retryable = True
+            outcome = {"http_status": 0, "response_body": str(e)}
 
-                print(
-                    f"[FNB WEBHOOK] Failed to send {event_type} to {webhook_url}: {e}"
+            print(
+                f"[FNB WEBHOOK] Failed to send {len(batch)} events to {webhook_url}: {e}"
+            )
+
+        now = datetime.utcnow()
+        outcome["delivery_attempts"] = FNBWebhookLog.delivery_attempts + 1
+        log_ids = [event["log_id"] for event in batch]
+        if delivered:
+            updates = [(dict(outcome, delivered_at=now, next_retry_at=None), log_ids)]
+        elif not retryable:
+            # Dead-lettered: no delivery time and no retry time
+            updates = [(dict(outcome, next_retry_at=None), log_ids)]
+        else:
+            # Exponential backoff (1s, 2s, 4s, ...) until the attempts run out
+            by_attempts: Dict[int, List[str]] = {}
+            for event in batch:
+                by_attempts.setdefault(event["attempts"] + 1, []).append(
+                    event["log_id"]
                 )
+            updates = [
+                (
+                    dict(
+                        outcome,
+                        next_retry_at=now + timedelta(seconds=2 ** (attempts - 1))
+                        if attempts < FNBConfig.WEBHOOK_MAX_ATTEMPTS
+                        else None,
+                    ),
+                    attempt_log_ids,
+                )
+                for attempts, attempt_log_ids in by_attempts.items()
+            ]
 
-            finally:
-                fnb_db.session.add(webhook_log)
+        with fnb_app.app_context():
+            try:
+                for values, update_log_ids in updates:
+                    FNBWebhookLog.query.filter(
+                        FNBWebhookLog.id.in_(update_log_ids)
+                    ).update(values, synchronize_session=False)
                 fnb_db.session.commit()
+            except Exception as e:
+                fnb_db.session.rollback()
+                print(f"[FNB WEBHOOK] Delivery log update failed: {e}")
+
+
+webhook_dispatcher = FNBWebhookDispatcher()
+
+
+class FNBWebhookService:
+    """FNB Webhook Service for external notifications"""
+
+    @staticmethod
+    def send_webhook(event_type: str, payload: Dict, webhook_url: str = None):
+        """Log a webhook notification and queue it for batched delivery"""
+        FNBWebhookService.send_webhooks(event_type, [payload], webhook_url)
+
+    @staticmethod
+    def send_webhooks(event_type: str, payloads: List[Dict], webhook_url: str = None):
+        """Log several notifications in one commit and queue them for delivery"""
+        if not webhook_url:
+            webhook_url = FNBConfig.PHANTOM_BANKING_WEBHOOK
 
-        # Send webhook asynchronously
-        threading.Thread(target=_send_async).start()
+        # Create webhook logs leased to this process; should it die before
+        # delivering, the retry sweep picks the rows up once the lease runs out
+        retry_at = datetime.utcnow() + timedelta(
+            seconds=FNBConfig.WEBHOOK_LEASE_SECONDS
+        )
+        webhook_logs = [
+            FNBWebhookLog(
+                webhook_url=webhook_url,
+                event_type=event_type,
+                payload=json.dumps(payload),
+                next_retry_at=retry_at,
+            )
+            for payload in payloads
+        ]
+        fnb_db.session.add_all(webhook_logs)
+        fnb_db.session.commit()
+
+        for webhook_log, payload in zip(webhook_logs, payloads):
+            webhook_dispatcher.enqueue(webhook_url, webhook_log.id, event_type, payload)
 
 
 class MobileMoneyService:
@@ -524,13 +1156,14 @@ class MobileMoneyService:
             fee = amount * provider_info["fee_rate"]
             net_amount = amount - fee
 
-            # Find target account
-            account = FNBAccount.query.filter_by(account_number=target_account).first()
-            if not account:
-                return {"success": False, "error": "Target account not found"}
-
-            # Process deposit
-            account.update_balance(net_amount, "CREDIT")
+            # Credit the target account in a single statement, no prior SELECT
+            account = FNBAccountService._post_delta(target_account, net_amount)
+            if account is None:
+                fnb_db.session.rollback()
+                reason = FNBAccountService._rejection_reason(target_account)
+                if reason == "Account not found":
+                    reason = "Target account not found"
+                return {"success": False, "error": reason}
 
             # Create transaction record
             transaction = FNBTransaction(
@@ -548,6 +1181,7 @@ class MobileMoneyService:
 
             fnb_db.session.add(transaction)
             fnb_db.session.commit()
+            balance_cache.invalidate(target_account)
 
             return {
                 "success": True,
@@ -618,6 +1252,21 @@ transaction_model = fnb_api.model(
     },
 )
 
+transaction_batch_model = fnb_api.model(
+    "TransactionBatch",
+    {
+        "transactions": fields.List(
+            fields.Nested(transaction_model), required=True, description="Postings"
+        ),
+    },
+)
+
+
+def _page_size() -> int:
+    """Requested ?limit=, clamped to the configured bounds"""
+    limit = request.args.get("limit", FNBConfig.DEFAULT_PAGE_SIZE, type=int)
+    return min(max(limit, 1), FNBConfig.MAX_PAGE_SIZE)
+
 
 # Account Management Endpoints
 @account_ns.route("/create")
@@ -649,12 +1298,43 @@ class AccountBalance(Resource):
             return {"error": result["error"]}, 404
 
 
+@account_ns.route("/balance-cache")
+class BalanceCacheStats(Resource):
+    @account_ns.doc("balance_cache_stats")
+    def get(self):
+        """Balance cache hit-rate counters"""
+        return balance_cache.stats()
+
+
 @account_ns.route("/list")
 class AccountList(Resource):
     @account_ns.doc("list_accounts")
     def get(self):
-        """List all accounts (for testing)"""
-        accounts = FNBAccount.query.filter_by(status="ACTIVE").all()
+        """List active accounts a page at a time (for testing)"""
+        limit = _page_size()
+        cursor = request.args.get("cursor")
+
+        # Customers come in on the same SELECT, and only the listed columns load
+        query = (
+            FNBAccount.query.options(
+                load_only(
+                    FNBAccount.account_number,
+                    FNBAccount.account_type,
+                    FNBAccount.balance,
+                    FNBAccount.status,
+                    FNBAccount.phantom_wallet_id,
+                ),
+                joinedload(FNBAccount.customer).load_only(
+                    FNBCustomer.first_name, FNBCustomer.last_name
+                ),
+            )
+            .filter_by(status="ACTIVE")
+            .order_by(FNBAccount.account_number)
+        )
+        if cursor:
+            # Seek past the last account already returned instead of OFFSET
+            query = query.filter(FNBAccount.account_number > cursor)
+        accounts = query.limit(limit).all()
 
         return {
             "accounts": [
@@ -669,7 +1349,10 @@ class AccountList(Resource):
                     "phantom_wallet_id": acc.phantom_wallet_id,
                 }
                 for acc in accounts
-            ]
+            ],
+            "next_cursor": accounts[-1].account_number
+            if len(accounts) == limit
+            else None,
         }
 
 
@@ -702,22 +1385,76 @@ class ProcessTransaction(Resource):
             return {"error": result["error"]}, 400
 
 
+@transaction_ns.route("/process-batch")
+class ProcessTransactionBatch(Resource):
+    @transaction_ns.doc("process_transaction_batch")
+    @transaction_ns.expect(transaction_batch_model)
+    def post(self):
+        """Process a batch of account transactions in one database transaction"""
+        items = request.json.get("transactions", [])
+        result = FNBAccountService.process_transactions_bulk(items)
+
+        if result["success"]:
+            timestamp = datetime.utcnow().isoformat()
+            FNBWebhookService.send_webhooks(
+                "transaction_processed",
+                [
+                    {
+                        "event_type": "transaction_processed",
+                        "transaction_id": posted["transaction_id"],
+                        "account_number": item["account_number"],
+                        "amount": item["amount"],
+                        "transaction_type": item["transaction_type"],
+                        "new_balance": posted["new_balance"],
+                        "timestamp": timestamp,
+                        "phantom_transaction_id": item.get("phantom_transaction_id"),
+                    }
+                    for item, posted in zip(items, result["transactions"])
+                ],
+            )
+
+            return result, 200
+        else:
+            return {"error": result["error"]}, 400
+
+
 @transaction_ns.route("/<string:account_number>/history")
 class TransactionHistory(Resource):
     @transaction_ns.doc("transaction_history")
     def get(self, account_number):
-        """Get transaction history for account"""
-        account = FNBAccount.query.filter_by(account_number=account_number).first()
-        if not account:
+        """Get transaction history for account, newest first, a page at a time"""
+        account_id = (
+            fnb_db.session.query(FNBAccount.id)
+            .filter_by(account_number=account_number)
+            .scalar()
+        )
+        if not account_id:
             return {"error": "Account not found"}, 404
 
-        transactions = (
-            FNBTransaction.query.filter_by(account_id=account.id)
-            .order_by(FNBTransaction.processing_date.desc())
-            .limit(50)
-            .all()
+        limit = _page_size()
+        query = FNBTransaction.query.filter_by(account_id=account_id).order_by(
+            FNBTransaction.processing_date.desc(), FNBTransaction.id.desc()
         )
 
+        # Cursor is the id of the last row already returned; its stored date is
+        # read in SQL so the comparison never depends on datetime formatting
+        cursor = request.args.get("cursor")
+        if cursor:
+            last = aliased(FNBTransaction)
+            last_date = (
+                select(last.processing_date).where(last.id == cursor).scalar_subquery()
+            )
+            query = query.filter(
+                or_(
+                    FNBTransaction.processing_date < last_date,
+                    and_(
+                        FNBTransaction.processing_date == last_date,
+                        FNBTransaction.id < cursor,
+                    ),
+                )
+            )
+        transactions = query.limit(limit).all()
+
         return {
             "account_number": account_number,
             "transactions": [
@@ -734,6 +1471,7 @@ class TransactionHistory(Resource):
                 }
                 for t in transactions
             ],
+            "next_cursor": transactions[-1].id if len(transactions) == limit else None,
         }
 
 
@@ -816,6 +1554,11 @@ class WebhookLogs(Resource):
                     "webhook_url": log.webhook_url,
                     "http_status": log.http_status,
                     "delivery_attempts": log.delivery_attempts,
+                    "status": "DELIVERED"
+                    if log.delivered_at
+                    else "PENDING"
+                    if log.next_retry_at
+                    else "FAILED",
                     "created_at": log.created_at.isoformat(),
                     "delivered_at": log.delivered_at.isoformat()
                     if log.delivered_at
@@ -978,6 +1721,9 @@ if __name__ == "__main__":
     with fnb_app.app_context():
         init_fnb_db()
 
+    # Resumes any webhooks a previous run logged but did not deliver
+    webhook_dispatcher.start()
+
     print("📊 Mock bank ready for integration testing")
     print("🌐 FNB Mock Bank URLs:")
     print("   Admin Console: http://localhost:5001")
@@ -0,0 +1,23 @@
+// Note: In a real implementation, you would use Chart.js here
+// For demo purposes, we're showing placeholder canvas elements
+
+// Simulate real-time updates; driven by requestAnimationFrame so a
+// hidden tab does no work, with the metric nodes looked up once
+const elements = document.querySelectorAll('.impact-number, .stat-number');
+let lastUpdate = 0;
+function tick(now) {
+    if (now - lastUpdate > 5000 && document.visibilityState === 'visible') {
+        lastUpdate = now;
+        // Update random metrics to show live data; the pulses are
+        // applied and cleared as one batch of class changes
+        const pulsing = [...elements].filter(() => Math.random() < 0.1);
+        if (pulsing.length) {
+            pulsing.forEach(el => el.classList.add('pulse'));
+            setTimeout(() => requestAnimationFrame(() => {
+                pulsing.forEach(el => el.classList.remove('pulse'));
+            }), 300);
+        }
+    }
+    requestAnimationFrame(tick);
+}
+requestAnimationFrame(tick);
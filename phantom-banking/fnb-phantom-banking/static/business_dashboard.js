@@ -0,0 +1,55 @@
+function copyApiKey() {
+    const apiKey = document.getElementById('apiKey').textContent.trim();
+    navigator.clipboard.writeText(apiKey).then(() => {
+        alert('API key copied to clipboard!');
+    });
+}
+
+function processPaymentFor(walletId) {
+    window.location.href = `/business/process-payment?wallet=${walletId}`;
+}
+
+function viewWalletDetails(walletId) {
+    alert(`Wallet details for ID: ${walletId}\nThis would open a detailed wallet view.`);
+}
+
+function refreshDashboard() {
+    location.reload();
+}
+
+// Live stats pushed by the server whenever a wallet or payment lands
+function addToStat(id, delta, asMoney) {
+    const el = document.getElementById(id);
+    if (!el) return;
+    const value = parseFloat(el.dataset.value || el.textContent) + delta;
+    el.dataset.value = value;
+    el.textContent = asMoney
+        ? `BWP ${value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`
+        : value;
+}
+
+function updateStats(delta) {
+    if (delta.type === 'payment') {
+        addToStat('todaysTransactions', 1, false);
+        addToStat('todaysVolume', delta.amount, true);
+        addToStat('totalBalance', delta.amount, true);
+    } else if (delta.type === 'wallets') {
+        addToStat('totalWallets', delta.count, false);
+    }
+    document.getElementById('lastUpdated').textContent = 
+        `Last updated: ${new Date().toLocaleTimeString()}`;
+}
+
+new EventSource('/business/stream').onmessage = e => updateStats(JSON.parse(e.data));
+
+// Highlight new transactions with animation
+const rows = document.querySelectorAll('#transactionsTable tr');
+rows.forEach((row, index) => {
+    if (index < 3) { // Highlight first 3 transactions as "new"
+        row.style.backgroundColor = '#f0f8f0';
+        row.style.transition = 'background-color 3s ease';
+        setTimeout(() => {
+            row.style.backgroundColor = '';
+        }, 3000);
+    }
+});
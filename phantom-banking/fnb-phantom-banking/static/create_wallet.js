@@ -0,0 +1,89 @@
+document.getElementById('createWalletForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const walletData = {
+        name: formData.get('name'),
+        phone: formData.get('phone'),
+        email: formData.get('email'),
+        daily_limit: parseFloat(formData.get('daily_limit')),
+        customer_type: formData.get('customer_type')
+    };
+
+    const submitBtn = this.querySelector('button[type="submit"]');
+    submitBtn.disabled = true;
+    submitBtn.textContent = 'Creating Wallet...';
+
+    try {
+        const response = await fetch('/business/create-wallet', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(walletData)
+        });
+
+        const result = await response.json();
+        const resultDiv = document.getElementById('createResult');
+        resultDiv.style.display = 'block';
+
+        if (result.success) {
+            resultDiv.style.background = '#d4edda';
+            resultDiv.style.color = '#155724';
+            resultDiv.style.border = '1px solid #c3e6cb';
+            resultDiv.style.padding = '20px';
+            resultDiv.style.borderRadius = '10px';
+
+            resultDiv.innerHTML = `
+                <h4>✅ Wallet Created Successfully!</h4>
+                <div style="margin: 15px 0;">
+                    <p><strong>Wallet ID:</strong> ${result.wallet.id}</p>
+                    <p><strong>Customer:</strong> ${result.wallet.customer_name}</p>
+                    <p><strong>Phone:</strong> ${result.wallet.customer_phone}</p>
+                    <p><strong>USSD Code:</strong> <span style="font-family: monospace; background: #fff; padding: 5px; border-radius: 4px;">${result.wallet.ussd_code}</span></p>
+                    <p><strong>Daily Limit:</strong> BWP ${result.wallet.daily_limit.toLocaleString()}</p>
+                    <p><strong>Status:</strong> ${result.wallet.status.toUpperCase()}</p>
+                </div>
+                <div style="background: #fff3cd; padding: 15px; border-radius: 8px; margin-top: 15px;">
+                    <strong>📱 Customer Instructions:</strong><br>
+                    Your customer can now receive payments using their USSD code: <strong>${result.wallet.ussd_code}</strong><br>
+                    They can dial this code on any phone to access their wallet.
+                </div>
+                <div style="margin-top: 20px;">
+                    <button onclick="window.location.href='/business/dashboard'" class="btn btn-success">View in Dashboard</button>
+                    <button onclick="location.reload()" class="btn">Create Another Wallet</button>
+                </div>
+            `;
+
+            // Reset form
+            this.reset();
+        } else {
+            resultDiv.style.background = '#f8d7da';
+            resultDiv.style.color = '#721c24';
+            resultDiv.style.border = '1px solid #f5c6cb';
+            resultDiv.style.padding = '20px';
+            resultDiv.style.borderRadius = '10px';
+
+            resultDiv.innerHTML = `
+                <h4>❌ Error Creating Wallet</h4>
+                <p>${result.error}</p>
+                <button onclick="this.parentElement.style.display='none'" class="btn">Try Again</button>
+            `;
+        }
+    } catch (error) {
+        const resultDiv = document.getElementById('createResult');
+        resultDiv.style.display = 'block';
+        resultDiv.style.background = '#f8d7da';
+        resultDiv.style.color = '#721c24';
+        resultDiv.style.border = '1px solid #f5c6cb';
+        resultDiv.style.padding = '20px';
+        resultDiv.style.borderRadius = '10px';
+        resultDiv.innerHTML = `
+            <h4>❌ Network Error</h4>
+            <p>Failed to create wallet. Please try again.</p>
+        `;
+    } finally {
+        submitBtn.disabled = false;
+        submitBtn.textContent = '🆕 Create Phantom Wallet';
+    }
+});
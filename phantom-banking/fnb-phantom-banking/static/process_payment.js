@@ -0,0 +1,119 @@
+// Only the most recent wallets are rendered with the page; typing in the
+// search box replaces the options with matches from the server
+const walletSelect = document.querySelector('select[name="wallet_id"]');
+let searchTimer;
+
+document.getElementById('walletSearch').addEventListener('input', function() {
+    clearTimeout(searchTimer);
+    const query = this.value.trim();
+    if (!query) {
+        return;
+    }
+    searchTimer = setTimeout(async () => {
+        const response = await fetch(`/business/wallets/search?q=${encodeURIComponent(query)}`);
+        const { wallets } = await response.json();
+        walletSelect.length = 1; // keep the placeholder option
+        wallets.forEach(wallet => {
+            walletSelect.add(new Option(
+                `${wallet.customer_name} (${wallet.customer_phone}) - BWP ${wallet.balance.toFixed(2)}`,
+                wallet.id
+            ));
+        });
+    }, 250);
+});
+
+document.getElementById('processPaymentForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const paymentData = {
+        wallet_id: formData.get('wallet_id'),
+        amount: parseFloat(formData.get('amount')),
+        method: formData.get('method'),
+        description: formData.get('description'),
+        source_info: {
+            customer_reference: formData.get('customer_reference'),
+            processed_via: 'business_dashboard',
+            timestamp: new Date().toISOString()
+        }
+    };
+
+    const submitBtn = this.querySelector('button[type="submit"]');
+    submitBtn.disabled = true;
+    submitBtn.textContent = 'Processing Payment...';
+
+    try {
+        const response = await fetch('/business/process-payment', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(paymentData)
+        });
+
+        const result = await response.json();
+        const resultDiv = document.getElementById('paymentResult');
+        resultDiv.style.display = 'block';
+
+        if (result.success) {
+            resultDiv.style.background = '#d4edda';
+            resultDiv.style.color = '#155724';
+            resultDiv.style.border = '1px solid #c3e6cb';
+            resultDiv.style.padding = '20px';
+            resultDiv.style.borderRadius = '10px';
+
+            resultDiv.innerHTML = `
+                <h4>✅ Payment Processed Successfully!</h4>
+                <div style="margin: 15px 0;">
+                    <p><strong>Transaction ID:</strong> ${result.transaction_id}</p>
+                    <p><strong>Reference:</strong> ${result.reference}</p>
+                    <p><strong>Amount:</strong> BWP ${result.formatted_amount}</p>
+                    <p><strong>New Balance:</strong> BWP ${result.formatted_balance}</p>
+                    <p><strong>Processed:</strong> ${result.formatted_timestamp}</p>
+                </div>
+                <div style="background: #e8f5e8; padding: 15px; border-radius: 8px; margin-top: 15px;">
+                    <strong>📊 Impact:</strong><br>
+                    • Customer wallet balance updated instantly<br>
+                    • Transaction recorded in FNB system<br>
+                    • Business analytics updated<br>
+                    • SMS/Email notifications sent
+                </div>
+                <div style="margin-top: 20px;">
+                    <button onclick="window.location.href='/business/dashboard'" class="btn btn-success">View in Dashboard</button>
+                    <button onclick="location.reload()" class="btn">Process Another Payment</button>
+                </div>
+            `;
+
+            // Reset form
+            this.reset();
+        } else {
+            resultDiv.style.background = '#f8d7da';
+            resultDiv.style.color = '#721c24';
+            resultDiv.style.border = '1px solid #f5c6cb';
+            resultDiv.style.padding = '20px';
+            resultDiv.style.borderRadius = '10px';
+
+            resultDiv.innerHTML = `
+                <h4>❌ Payment Failed</h4>
+                <p><strong>Error:</strong> ${result.error}</p>
+                ${result.code ? `<p><strong>Code:</strong> ${result.code}</p>` : ''}
+                <button onclick="this.parentElement.style.display='none'" class="btn">Try Again</button>
+            `;
+        }
+    } catch (error) {
+        const resultDiv = document.getElementById('paymentResult');
+        resultDiv.style.display = 'block';
+        resultDiv.style.background = '#f8d7da';
+        resultDiv.style.color = '#721c24';
+        resultDiv.style.border = '1px solid #f5c6cb';
+        resultDiv.style.padding = '20px';
+        resultDiv.style.borderRadius = '10px';
+        resultDiv.innerHTML = `
+            <h4>❌ Network Error</h4>
+            <p>Failed to process payment. Please try again.</p>
+        `;
+    } finally {
+        submitBtn.disabled = false;
+        submitBtn.textContent = '💳 Process Payment';
+    }
+});
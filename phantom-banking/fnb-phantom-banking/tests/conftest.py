@@ -0,0 +1,106 @@
+"""
+Shared fixtures for the Phantom Banking and mock FNB test suites
+
+Both apps read DATABASE_URL when their module is imported, so each one is
+imported inside a session fixture pointed at its own throwaway SQLite file.
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _import_with_database(module_name: str, database_path) -> object:
+    """Import an app module with DATABASE_URL pointed at database_path"""
+    previous = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    try:
+        return importlib.import_module(module_name)
+    finally:
+        if previous is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = previous
+
+
+@pytest.fixture(scope="session")
+def phantom(tmp_path_factory):
+    """The Phantom Banking app module, with tables created and demo data seeded"""
+    module = _import_with_database(
+        "comprehensive_phantom_banking",
+        tmp_path_factory.mktemp("phantom") / "phantom.db",
+    )
+    with module.app.app_context():
+        module.init_enterprise_db()
+    return module
+
+
+@pytest.fixture
+def phantom_client(phantom):
+    """Test client on the Phantom Banking app, with its in-process caches cleared"""
+    phantom.dashboard_cache.clear()
+    with phantom.app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def fnb(tmp_path_factory):
+    """The mock FNB bank module, with its tables created"""
+    module = _import_with_database(
+        "mock_fnb_bank", tmp_path_factory.mktemp("fnb") / "fnb.db"
+    )
+    with module.fnb_app.app_context():
+        module.init_fnb_db()
+    return module
+
+
+@pytest.fixture
+def fnb_context(fnb):
+    """An application context on the mock bank for the duration of a test"""
+    with fnb.fnb_app.app_context():
+        yield
+        fnb.fnb_db.session.rollback()
+
+
+@pytest.fixture
+def fnb_account(fnb, fnb_context):
+    """Factory for active mock bank accounts; returns the account number"""
+
+    def create(balance: float = 100.0, status: str = "ACTIVE") -> str:
+        result = fnb.FNBAccountService.create_customer_and_account(
+            {
+                "customer_name": "Test Holder",
+                "customer_phone": "+267 71 000 000",
+                "initial_balance": balance,
+            }
+        )
+        assert result["success"], result
+        if status != "ACTIVE":
+            fnb.FNBAccount.query.filter_by(
+                account_number=result["account_number"]
+            ).update({"status": status})
+            fnb.fnb_db.session.commit()
+        return result["account_number"]
+
+    return create
+
+
+@pytest.fixture
+def fnb_balances(fnb, fnb_context):
+    """Reads an account's committed (balance, available_balance)"""
+
+    def read(account_number: str) -> tuple:
+        fnb.fnb_db.session.expire_all()
+        return tuple(
+            fnb.fnb_db.session.query(
+                fnb.FNBAccount.balance, fnb.FNBAccount.available_balance
+            )
+            .filter_by(account_number=account_number)
+            .one()
+        )
+
+    return read
@@ -0,0 +1,132 @@
+"""Business analytics served from the daily KPI rollup"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from test_business_management import _pay_demo_wallet
+
+
+@pytest.fixture
+def analytics(phantom, phantom_client):
+    """Fetch the demo business's analytics with one of its API keys"""
+    with phantom.app.app_context():
+        api_key = (
+            phantom.db.session.query(phantom.APIKey.key)
+            .filter_by(business_id=phantom._demo_business_id(), is_active=True)
+            .limit(1)
+            .scalar()
+        )
+
+    def get() -> dict:
+        response = phantom_client.get(
+            "/api/v1/business/analytics",
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+        assert response.status_code == 200, response.data
+        return response.get_json()["business_metrics"]
+
+    return get
+
+
+def _refresh(phantom, full: bool = False):
+    with phantom.app.app_context():
+        phantom.MetricsService.refresh_business_daily_metrics(full)
+
+
+def test_refresh_brings_a_payment_into_analytics(phantom, analytics, monkeypatch):
+    # As in a gunicorn worker whose rollup the jobs worker refreshes
+    monkeypatch.setattr(phantom.MetricsService, "refreshed_elsewhere", True)
+    _refresh(phantom, full=True)
+    before = analytics()
+
+    assert _pay_demo_wallet(phantom, amount=12.5)["success"]
+    # Transaction figures come from the rollup, so wait for the next refresh
+    assert analytics()["total_transaction_count"] == before["total_transaction_count"]
+    _refresh(phantom)
+    after = analytics()
+
+    assert after["total_transaction_count"] == before["total_transaction_count"] + 1
+    assert after["total_deposit_volume"] == pytest.approx(
+        before["total_deposit_volume"] + 12.5
+    )
+    assert after["current_month_transactions"] == (
+        before["current_month_transactions"] + 1
+    )
+
+
+def test_stale_rollup_is_refreshed_on_read(phantom, analytics, monkeypatch):
+    # No background refresher runs in this process, as under `flask run`
+    before = analytics()
+    assert _pay_demo_wallet(phantom, amount=4.0)["success"]
+    monkeypatch.setattr(
+        phantom.MetricsService,
+        "_last_refresh",
+        time.monotonic() - phantom.MetricsService.REFRESH_INTERVAL_SECONDS - 1,
+    )
+
+    after = analytics()
+
+    assert after["total_transaction_count"] == before["total_transaction_count"] + 1
+
+
+def test_refresh_clears_days_left_without_transactions(phantom):
+    metric = phantom.BusinessDailyMetric
+    today = datetime.utcnow().date()
+    old_day = datetime(2000, 1, 1).date()
+    with phantom.app.app_context():
+        business = phantom.Business(
+            name="Rollup Test Merchant",
+            email="rollup@phantom.test",
+            phone="+267 700 0000",
+            password_hash="-",
+            fnb_account_number="0000000000",
+        )
+        phantom.db.session.add(business)
+        phantom.db.session.flush()
+        business_id = business.id
+        # Days the rollup still holds although their transactions were cancelled
+        phantom.db.session.add_all(
+            metric(business_id=business_id, day=day, volume=99.0, transaction_count=1)
+            for day in (today, old_day)
+        )
+        phantom.db.session.commit()
+
+    _refresh(phantom)
+    with phantom.app.app_context():
+        assert phantom.db.session.get(metric, (business_id, today)) is None
+        # Outside the refreshed window, so only a full refresh clears it
+        assert phantom.db.session.get(metric, (business_id, old_day)) is not None
+
+    _refresh(phantom, full=True)
+    with phantom.app.app_context():
+        assert phantom.db.session.get(metric, (business_id, old_day)) is None
+
+
+def test_repeated_refreshes_rewrite_the_same_days(phantom, analytics, monkeypatch):
+    monkeypatch.setattr(phantom.MetricsService, "refreshed_elsewhere", True)
+    _refresh(phantom, full=True)
+    before = analytics()
+
+    # Each pass rewrites rows that already exist instead of adding more
+    _refresh(phantom)
+    _refresh(phantom)
+    _refresh(phantom, full=True)
+    with phantom.app.app_context():
+        days = phantom.db.session.query(phantom.BusinessDailyMetric).count()
+        distinct = (
+            phantom.db.session.query(
+                phantom.BusinessDailyMetric.business_id,
+                phantom.BusinessDailyMetric.day,
+            )
+            .distinct()
+            .count()
+        )
+
+    assert days == distinct
+    after = analytics()
+    assert after["total_transaction_count"] == before["total_transaction_count"]
+    assert after["total_deposit_volume"] == pytest.approx(
+        before["total_deposit_volume"]
+    )
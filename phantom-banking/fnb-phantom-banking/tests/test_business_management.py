@@ -0,0 +1,90 @@
+"""Business dashboard caching and revalidation"""
+
+
+def _pay_demo_wallet(phantom, amount: float = 10.0) -> dict:
+    """Pay the first demo wallet through the payment processor"""
+    with phantom.app.test_request_context():
+        wallet_id = (
+            phantom.db.session.query(phantom.PhantomWallet.id)
+            .filter_by(business_id=phantom._demo_business_id())
+            .order_by(phantom.PhantomWallet.created_at)
+            .limit(1)
+            .scalar()
+        )
+        return phantom.PaymentProcessor.process_payment(
+            phantom.PaymentRequest(
+                wallet_id=wallet_id,
+                amount=amount,
+                method=phantom.PaymentMethod.QR,
+                description="Dashboard test payment",
+            )
+        )
+
+
+def test_dashboard_revalidation_returns_304(phantom_client):
+    first = phantom_client.get("/business/dashboard")
+    assert first.status_code == 200
+    assert b"FNB Demo Merchant" in first.data
+    etag, _ = first.get_etag()
+
+    second = phantom_client.get(
+        "/business/dashboard", headers={"If-None-Match": f'"{etag}"'}
+    )
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.get_etag() == (etag, False)
+
+
+def test_dashboard_etag_moves_after_a_payment(phantom, phantom_client):
+    etag, _ = phantom_client.get("/business/dashboard").get_etag()
+
+    assert _pay_demo_wallet(phantom)["success"]
+    response = phantom_client.get(
+        "/business/dashboard", headers={"If-None-Match": f'"{etag}"'}
+    )
+
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+
+
+def test_dashboard_page_is_clamped_to_page_count(phantom, phantom_client):
+    # The seeded demo business has fewer wallets than one page holds
+    first_page, _ = phantom_client.get("/business/dashboard").get_etag()
+
+    response = phantom_client.get("/business/dashboard?page=999")
+
+    assert response.status_code == 200
+    assert response.get_etag()[0] == first_page
+    page_keys = [
+        key
+        for key in phantom.dashboard_cache._data
+        if isinstance(key, tuple) and key[0] == phantom._demo_business_id()
+    ]
+    assert [key[2] for key in page_keys] == [1]
+
+
+def test_streamed_dashboard_is_not_buffered_for_compression(phantom_client):
+    response = phantom_client.get(
+        "/business/dashboard", headers={"Accept-Encoding": "br, gzip"}
+    )
+
+    # Flask-Compress would otherwise read the whole stream to compress it
+    assert response.is_streamed
+    assert "Content-Encoding" not in response.headers
+    assert b"FNB Demo Merchant" in response.get_data()
+
+
+def test_payment_invalidates_cache_and_pushes_delta(phantom, phantom_client):
+    phantom_client.get("/business/dashboard")
+    business_id = phantom._demo_business_id()
+    assert phantom.dashboard_cache.get(business_id) is not None
+    subscriber = phantom.dashboard_events.subscribe(business_id)
+    try:
+        assert _pay_demo_wallet(phantom, amount=7.0)["success"]
+
+        assert phantom.dashboard_cache.get(business_id) is None
+        delta = subscriber.get_nowait()
+        assert (delta["type"], delta["amount"]) == ("payment", 7.0)
+    finally:
+        phantom.dashboard_events.unsubscribe(business_id, subscriber)
@@ -0,0 +1,13 @@
+"""Phantom Banking startup against a database that is already seeded"""
+
+
+def test_warm_start_skips_the_demo_seed(phantom, monkeypatch):
+    def fail(password):
+        raise AssertionError("demo password hashed on a warm start")
+
+    monkeypatch.setattr(phantom, "generate_password_hash", fail)
+    with phantom.app.app_context():
+        businesses = phantom.Business.query.count()
+        phantom.init_enterprise_db()
+
+        assert phantom.Business.query.count() == businesses
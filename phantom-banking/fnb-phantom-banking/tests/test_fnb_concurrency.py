@@ -0,0 +1,46 @@
+"""Concurrent mock FNB postings against one account never overdraw it"""
+
+import threading
+
+
+def _debit(account_number: str, amount: float) -> dict:
+    return {
+        "account_number": account_number,
+        "transaction_type": "DEBIT",
+        "amount": amount,
+    }
+
+
+def test_concurrent_single_and_batch_debits_never_overdraw(
+    fnb, fnb_account, fnb_balances
+):
+    service = fnb.FNBAccountService
+
+    for _ in range(20):
+        # Either posting alone fits the balance; both together would overdraw
+        account_number = fnb_account(balance=100.0)
+        postings = {
+            "single": lambda: service.process_transaction(_debit(account_number, 60.0)),
+            "batch": lambda: service.process_transactions_bulk(
+                [_debit(account_number, 30.0), _debit(account_number, 30.0)]
+            ),
+        }
+        barrier = threading.Barrier(len(postings))
+        results = {}
+
+        def post(name):
+            with fnb.fnb_app.app_context():
+                barrier.wait()
+                results[name] = postings[name]()
+
+        threads = [threading.Thread(target=post, args=(name,)) for name in postings]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        succeeded = [name for name, result in results.items() if result["success"]]
+        assert len(succeeded) == 1, results
+        refused = results["batch" if succeeded == ["single"] else "single"]
+        assert "Insufficient funds" in refused["error"]
+        assert fnb_balances(account_number) == (40.0, 40.0)
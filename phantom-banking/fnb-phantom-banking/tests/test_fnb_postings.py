@@ -0,0 +1,136 @@
+"""Mock FNB bank postings: single and bulk, and why they are refused"""
+
+
+def _debit(account_number: str, amount: float) -> dict:
+    return {
+        "account_number": account_number,
+        "transaction_type": "DEBIT",
+        "amount": amount,
+    }
+
+
+def _credit(account_number: str, amount: float) -> dict:
+    return {
+        "account_number": account_number,
+        "transaction_type": "CREDIT",
+        "amount": amount,
+    }
+
+
+def test_single_debit_moves_both_balances(fnb, fnb_account, fnb_balances):
+    account_number = fnb_account(balance=100.0)
+
+    result = fnb.FNBAccountService.process_transaction(_debit(account_number, 40.0))
+
+    assert result["success"], result
+    assert result["old_balance"] == 100.0
+    assert result["new_balance"] == 60.0
+    assert fnb_balances(account_number) == (60.0, 60.0)
+
+
+def test_single_posting_rejection_reasons(fnb, fnb_account, fnb_balances):
+    active = fnb_account(balance=10.0)
+    frozen = fnb_account(balance=500.0, status="FROZEN")
+    service = fnb.FNBAccountService
+
+    assert service.process_transaction(_debit("6200000000", 1.0))["error"] == (
+        "Account not found"
+    )
+    assert service.process_transaction(_credit(frozen, 1.0))["error"] == (
+        "Account is not active"
+    )
+    assert service.process_transaction(_debit(active, 10.01))["error"] == (
+        "Insufficient funds"
+    )
+    assert fnb_balances(active) == (10.0, 10.0)
+    assert fnb_balances(frozen) == (500.0, 500.0)
+
+
+def test_bulk_posts_running_balances(fnb, fnb_account, fnb_balances):
+    first = fnb_account(balance=100.0)
+    second = fnb_account(balance=0.0)
+
+    result = fnb.FNBAccountService.process_transactions_bulk(
+        [
+            _debit(first, 70.0),
+            _credit(second, 25.0),
+            _credit(first, 50.0),
+            _debit(first, 80.0),
+        ]
+    )
+
+    assert result["success"], result
+    assert [item["new_balance"] for item in result["transactions"]] == [
+        30.0,
+        25.0,
+        80.0,
+        0.0,
+    ]
+    assert fnb_balances(first) == (0.0, 0.0)
+    assert fnb_balances(second) == (25.0, 25.0)
+
+
+def test_bulk_overdraw_rolls_back_whole_batch(fnb, fnb_account, fnb_balances):
+    funded = fnb_account(balance=100.0)
+    overdrawn = fnb_account(balance=100.0)
+    transactions_before = fnb.FNBTransaction.query.count()
+
+    result = fnb.FNBAccountService.process_transactions_bulk(
+        [
+            _credit(funded, 10.0),
+            _debit(overdrawn, 60.0),
+            _credit(overdrawn, 5.0),
+            _debit(overdrawn, 60.0),
+        ]
+    )
+
+    assert result == {"success": False, "error": "Item 3: Insufficient funds"}
+    assert fnb_balances(funded) == (100.0, 100.0)
+    assert fnb_balances(overdrawn) == (100.0, 100.0)
+    assert fnb.FNBTransaction.query.count() == transactions_before
+
+
+def test_bulk_checks_available_balance(fnb, fnb_account, fnb_balances):
+    account_number = fnb_account(balance=100.0)
+    # Funds on hold count towards the balance but cannot be debited
+    fnb.FNBAccount.query.filter_by(account_number=account_number).update(
+        {"available_balance": 30.0}
+    )
+    fnb.fnb_db.session.commit()
+
+    result = fnb.FNBAccountService.process_transactions_bulk(
+        [_debit(account_number, 50.0)]
+    )
+
+    assert result == {"success": False, "error": "Item 0: Insufficient funds"}
+    assert fnb_balances(account_number) == (100.0, 30.0)
+
+
+def test_bulk_rejects_unknown_and_inactive_accounts(fnb, fnb_account):
+    active = fnb_account(balance=100.0)
+    frozen = fnb_account(balance=100.0, status="FROZEN")
+    service = fnb.FNBAccountService
+
+    assert service.process_transactions_bulk(
+        [_credit(active, 1.0), _credit("6200000000", 1.0)]
+    ) == {"success": False, "error": "Item 1: Account not found"}
+    assert service.process_transactions_bulk(
+        [_credit(active, 1.0), _credit(frozen, 1.0)]
+    ) == {"success": False, "error": "Item 1: Account is not active"}
+
+
+def test_bulk_validates_items_before_writing(fnb, fnb_account, fnb_balances):
+    account_number = fnb_account(balance=100.0)
+    service = fnb.FNBAccountService
+
+    assert service.process_transactions_bulk([]) == {
+        "success": False,
+        "error": "No transactions supplied",
+    }
+    assert service.process_transactions_bulk(
+        [_credit(account_number, 1.0), _credit(account_number, 50000.01)]
+    ) == {"success": False, "error": "Item 1: Transaction amount exceeds limit"}
+    assert service.process_transactions_bulk(
+        [dict(_credit(account_number, 1.0), transaction_type="REFUND")]
+    ) == {"success": False, "error": "Item 0: Invalid transaction type"}
+    assert fnb_balances(account_number) == (100.0, 100.0)
@@ -0,0 +1,61 @@
+"""Mock FNB startup brings databases created by older releases up to date"""
+
+from datetime import datetime
+
+from sqlalchemy import create_engine, select, text
+
+
+def test_init_adds_columns_missing_from_existing_tables(
+    fnb, fnb_context, fnb_account, fnb_balances
+):
+    account_number = fnb_account(balance=100.0)
+    # An accounts table from before rows were versioned
+    fnb.fnb_db.session.execute(text("ALTER TABLE fnb_accounts DROP COLUMN version"))
+    fnb.fnb_db.session.commit()
+
+    fnb.init_fnb_db()
+    fnb.init_fnb_db()
+
+    assert "version" in fnb._column_names("fnb_accounts")
+    result = fnb.FNBAccountService.process_transaction(
+        {"account_number": account_number, "transaction_type": "DEBIT", "amount": 1.0}
+    )
+    assert result["success"], result
+    assert fnb_balances(account_number) == (99.0, 99.0)
+
+
+def test_timestamps_are_stamped_without_a_column_default(fnb, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    table = fnb.FNBWebhookLog.__table__
+    with engine.begin() as connection:
+        # The webhook log table as databases from before the default hold it
+        connection.execute(
+            text(
+                "CREATE TABLE fnb_webhook_logs (id VARCHAR(36) PRIMARY KEY,"
+                " webhook_url VARCHAR(255) NOT NULL, event_type VARCHAR(50)"
+                " NOT NULL, payload TEXT NOT NULL, http_status INTEGER,"
+                " response_body TEXT, delivery_attempts INTEGER,"
+                " created_at DATETIME, delivered_at DATETIME,"
+                " next_retry_at DATETIME)"
+            )
+        )
+        connection.execute(
+            table.insert(),
+            [
+                {
+                    "webhook_url": "http://phantom.test",
+                    "event_type": "a",
+                    "payload": "{}",
+                },
+                {
+                    "webhook_url": "http://phantom.test",
+                    "event_type": "b",
+                    "payload": "{}",
+                },
+            ],
+        )
+        stamps = connection.execute(select(table.c.created_at)).scalars().all()
+    engine.dispose()
+
+    assert len(stamps) == 2
+    assert all(isinstance(stamp, datetime) for stamp in stamps)
@@ -0,0 +1,127 @@
+"""Mock FNB webhook delivery: outcomes, retry scheduling and the retry sweep"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+WEBHOOK_URL = "http://phantom.test/webhooks/fnb"
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = "{}"
+
+
+@pytest.fixture
+def webhook_log(fnb, fnb_context):
+    """Factory for undelivered webhook log rows; returns the row id"""
+
+    def create(attempts: int = 0, next_retry_at: datetime = None) -> str:
+        log = fnb.FNBWebhookLog(
+            webhook_url=WEBHOOK_URL,
+            event_type="transaction.completed",
+            payload=json.dumps({"attempts": attempts}),
+            delivery_attempts=attempts,
+            next_retry_at=next_retry_at or datetime.utcnow() + timedelta(minutes=1),
+        )
+        fnb.fnb_db.session.add(log)
+        fnb.fnb_db.session.commit()
+        return log.id
+
+    return create
+
+
+@pytest.fixture
+def deliver(fnb, monkeypatch):
+    """Run one delivery of a logged event against a canned POST outcome"""
+
+    def run(log_id: str, attempts: int, outcome):
+        def post(url, **kwargs):
+            if isinstance(outcome, Exception):
+                raise outcome
+            return _Response(outcome)
+
+        monkeypatch.setattr(fnb.WEBHOOK_SESSION, "post", post)
+        fnb.FNBWebhookDispatcher._deliver(
+            WEBHOOK_URL,
+            [
+                {
+                    "log_id": log_id,
+                    "event_type": "transaction.completed",
+                    "payload": {},
+                    "attempts": attempts,
+                }
+            ],
+        )
+        fnb.fnb_db.session.expire_all()
+        return fnb.fnb_db.session.get(fnb.FNBWebhookLog, log_id)
+
+    return run
+
+
+def test_2xx_is_delivered(webhook_log, deliver):
+    log = deliver(webhook_log(), 0, 204)
+
+    assert log.delivered_at is not None
+    assert log.next_retry_at is None
+    assert (log.http_status, log.delivery_attempts) == (204, 1)
+
+
+@pytest.mark.parametrize("outcome", [503, 429, requests.ConnectionError("refused")])
+def test_retryable_failure_backs_off_exponentially(webhook_log, deliver, outcome):
+    before = datetime.utcnow()
+    log = deliver(webhook_log(attempts=2), 2, outcome)
+
+    # Third attempt failed, so the fourth waits 2 ** 2 seconds
+    assert log.delivered_at is None
+    assert log.delivery_attempts == 3
+    assert before + timedelta(seconds=4) <= log.next_retry_at
+    assert log.next_retry_at <= datetime.utcnow() + timedelta(seconds=4)
+
+
+def test_last_attempt_stops_retrying(fnb, webhook_log, deliver):
+    attempts = fnb.FNBConfig.WEBHOOK_MAX_ATTEMPTS - 1
+    log = deliver(webhook_log(attempts=attempts), attempts, 500)
+
+    assert log.delivered_at is None
+    assert log.next_retry_at is None
+    assert log.delivery_attempts == fnb.FNBConfig.WEBHOOK_MAX_ATTEMPTS
+
+
+def test_4xx_is_dead_lettered_not_delivered(webhook_log, deliver):
+    log = deliver(webhook_log(), 0, 404)
+
+    assert log.delivered_at is None
+    assert log.next_retry_at is None
+    assert (log.http_status, log.delivery_attempts) == (404, 1)
+
+
+def test_sweep_claims_due_rows_under_a_lease(fnb, webhook_log, monkeypatch):
+    due = webhook_log(
+        attempts=1, next_retry_at=datetime.utcnow() - timedelta(seconds=1)
+    )
+    not_due = webhook_log(attempts=1)
+    dispatcher = fnb.FNBWebhookDispatcher()
+    queued = []
+    monkeypatch.setattr(dispatcher, "enqueue", lambda *args: queued.append(args))
+
+    before = datetime.utcnow()
+    dispatcher._requeue_due()
+
+    # Rows left by other tests may come due too; only these two matter here
+    claimed = [args for args in queued if args[1] in (due, not_due)]
+    assert [args[1] for args in claimed] == [due]
+    assert claimed[0][4] == 1
+    fnb.fnb_db.session.expire_all()
+    # Still scheduled, so a crash before delivery leaves it to a later sweep
+    lease = fnb.fnb_db.session.get(fnb.FNBWebhookLog, due).next_retry_at
+    assert lease >= before + timedelta(seconds=fnb.FNBConfig.WEBHOOK_LEASE_SECONDS)
+    assert fnb.fnb_db.session.get(fnb.FNBWebhookLog, not_due).next_retry_at > before
+
+    # A claimed row is not handed out again while its lease runs
+    queued.clear()
+    dispatcher._requeue_due()
+    assert due not in [args[1] for args in queued]